@@ -1,17 +1,41 @@
+"""
+Synthetic team and player data generator.
+Without arguments it writes the small teams.json/players.json sample loaded on
+startup, 4 teams of 5 players unless --teams/--players are given. With
+--format ndjson or csv it streams datasets of any size, with a power-law
+distribution of team sizes, to be loaded with data.load_data.
+usage: python -m data.generate_data --teams 100000 --players 5000000 \
+    --skew 1.1 --format csv --output-dir /tmp/dataset
+"""
+
+import argparse
+import csv
 import json
+import os
+import random
 from datetime import datetime, timezone
+from typing import Dict, Iterator, List
+
+import orjson
 from faker import Faker
 
 faker = Faker()
 
+TEAM_FIELDS = ["team_id", "team_name", "team_password", "created_at"]
+PLAYER_FIELDS = ["team_id", "player_name", "created_at"]
+
 
-def generate_team_player_data():
+def generate_team_player_data(
+    team_count: int = 4, player_count: int = 20, output_dir: str = "."
+):
     now = datetime.now(timezone.utc)
     teams = []
     players = []
-    player_id_counter = 1
+    # Players are spread evenly, the first teams taking any remainder.
+    sizes = team_sizes(team_count, player_count, 0.0, random.Random(0))
+    sizes.sort(reverse=True)
 
-    for team_num in range(1, 5):  # 4 teams
+    for team_num in range(1, team_count + 1):
         team = {
             "team_name": f"Team{team_num}",
             "team_password": f"team{team_num}pass",
@@ -19,21 +43,156 @@ def generate_team_player_data():
         }
         teams.append(team)
 
-        for _ in range(5):  # 5 players per team
+        for _ in range(sizes[team_num - 1]):
             player = {
                 "team_id": team_num,  # team_num matches the team_id to simulate relationships
                 "player_name": faker.name(),
                 "created_at": now.isoformat(),
             }
             players.append(player)
-            player_id_counter += 1
 
-    with open("teams.json", "w") as f:
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "teams.json"), "w") as f:
         json.dump(teams, f, indent=4)
 
-    with open("players.json", "w") as f:
+    with open(os.path.join(output_dir, "players.json"), "w") as f:
         json.dump(players, f, indent=4)
 
 
+def team_sizes(teams: int, players: int, skew: float, rng: random.Random) -> List[int]:
+    """
+    Splits the players over the teams with sizes proportional to 1 / rank^skew,
+    so a few teams are large and most are small. skew=0 gives equal sizes.
+    """
+    weights = [1 / (rank**skew) for rank in range(1, teams + 1)]
+    total = sum(weights)
+    sizes = [int(players * weight / total) for weight in weights]
+    # Hand out the rounding remainder to the largest teams.
+    for index in range(players - sum(sizes)):
+        sizes[index % teams] += 1
+    rng.shuffle(sizes)
+    return sizes
+
+
+def generate_teams(
+    teams: int, password_hash: str, now: datetime
+) -> Iterator[Dict[str, object]]:
+    for team_id in range(1, teams + 1):
+        yield {
+            "team_id": team_id,
+            "team_name": f"Team{team_id}",
+            "team_password": password_hash,
+            "created_at": now.isoformat(),
+        }
+
+
+def generate_players(
+    sizes: List[int], rng: random.Random, now: datetime
+) -> Iterator[Dict[str, object]]:
+    # Sampling from fixed name pools is much faster than calling Faker per row.
+    first_names = list({faker.first_name() for _ in range(2000)})
+    last_names = list({faker.last_name() for _ in range(2000)})
+    created_at = now.isoformat()
+    for team_id, size in enumerate(sizes, start=1):
+        # Player names are unique within a team, as the service enforces.
+        names = set()
+        for _ in range(size):
+            name = f"{rng.choice(first_names)} {rng.choice(last_names)}"
+            if name in names:
+                name = f"{name} {len(names)}"
+            names.add(name)
+            yield {"team_id": team_id, "player_name": name, "created_at": created_at}
+
+
+def write_rows(path: str, rows: Iterator[Dict[str, object]], fields, fmt: str) -> int:
+    count = 0
+    if fmt == "csv":
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+    else:
+        with open(path, "wb") as f:
+            for row in rows:
+                f.write(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE))
+                count += 1
+    return count
+
+
+def generate_dataset(args):
+    # Imported here so the default sample generation needs no configuration.
+    from utils.logger import logger_config
+    from utils.security import hash_password_sync
+
+    log = logger_config(__name__)
+
+    rng = random.Random(args.seed)
+    Faker.seed(args.seed)
+    now = datetime.now(timezone.utc)
+    os.makedirs(args.output_dir, exist_ok=True)
+    # Every team shares one password, so it is hashed once instead of per row.
+    password_hash = hash_password_sync(args.password)
+
+    teams_path = os.path.join(args.output_dir, f"teams.{args.format}")
+    players_path = os.path.join(args.output_dir, f"players.{args.format}")
+    teams = write_rows(
+        teams_path,
+        generate_teams(args.teams, password_hash, now),
+        TEAM_FIELDS,
+        args.format,
+    )
+    sizes = team_sizes(args.teams, args.players, args.skew, rng)
+    players = write_rows(
+        players_path, generate_players(sizes, rng, now), PLAYER_FIELDS, args.format
+    )
+    log.info("Wrote %s teams to %s", teams, teams_path)
+    log.info(
+        "Wrote %s players to %s (largest team %s, smallest team %s)",
+        players,
+        players_path,
+        max(sizes),
+        min(sizes),
+    )
+
+
 if __name__ == "__main__":
-    generate_team_player_data()
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "ndjson", "csv"],
+        default="json",
+        help="json writes the startup sample; ndjson and csv stream a dataset",
+    )
+    parser.add_argument(
+        "--teams", type=int, help="defaults to 4 for json and 1000 otherwise"
+    )
+    parser.add_argument(
+        "--players", type=int, help="defaults to 20 for json and 50000 otherwise"
+    )
+    parser.add_argument(
+        "--skew",
+        type=float,
+        default=1.0,
+        help="power-law exponent of team sizes, 0 for equal sizes",
+    )
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output-dir", default=".")
+    args = parser.parse_args()
+
+    if args.format == "json":
+        generate_team_player_data(
+            args.teams if args.teams is not None else 4,
+            args.players if args.players is not None else 20,
+            args.output_dir,
+        )
+    else:
+        if args.teams is None:
+            args.teams = 1000
+        if args.players is None:
+            args.players = 50000
+        generate_dataset(args)
@@ -0,0 +1,84 @@
+"""
+Bulk loader for datasets written by data.generate_data. Rows are streamed into
+Postgres with COPY in a single transaction, and only into empty tables.
+usage: python -m data.load_data --teams /tmp/dataset/teams.csv \
+    --players /tmp/dataset/players.csv
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from typing import Iterator, List, Tuple
+
+import orjson
+
+from sqlalchemy import exists, text
+from sqlalchemy.future import select
+
+from data.generate_data import PLAYER_FIELDS, TEAM_FIELDS
+from data.session import DatabaseSession, db
+from models.player_model import Player
+from models.team_model import Team
+from utils.logger import logger_config
+
+log = logger_config(__name__)
+
+
+CONVERTERS = {"team_id": int, "created_at": datetime.fromisoformat}
+
+
+def read_records(path: str, fields: List[str]) -> Iterator[Tuple]:
+    with open(path, "rb") as f:
+        for line in f:
+            row = orjson.loads(line)
+            yield tuple(CONVERTERS.get(field, str)(row[field]) for field in fields)
+
+
+async def copy_file(connection, table: str, path: str, fields: List[str]):
+    if path.endswith(".csv"):
+        # CSV files go to the server as they are, without parsing them here.
+        return await connection.copy_to_table(
+            table, source=path, columns=fields, format="csv", header=True
+        )
+    return await connection.copy_records_to_table(
+        table, records=read_records(path, fields), columns=fields
+    )
+
+
+async def load_data(teams_path: str, players_path: str, database: DatabaseSession = db):
+    await database.create_database()
+    async with database.engine.begin() as conn:
+        for model in (Team, Player):
+            if await conn.scalar(select(exists().select_from(model))):
+                raise ValueError(
+                    f"Table {model.__tablename__} is not empty, refusing to load"
+                )
+        raw = await conn.get_raw_connection()
+        connection = raw.driver_connection
+
+        start = time.perf_counter()
+        result = await copy_file(connection, "teams", teams_path, TEAM_FIELDS)
+        log.info("Teams loaded (%s) in %.1fs", result, time.perf_counter() - start)
+        # Team ids come from the file, so move the sequence past them.
+        await conn.execute(
+            text(
+                "SELECT setval(pg_get_serial_sequence('teams', 'team_id'), "
+                "(SELECT max(team_id) FROM teams))"
+            )
+        )
+
+        start = time.perf_counter()
+        result = await copy_file(connection, "players", players_path, PLAYER_FIELDS)
+        log.info("Players loaded (%s) in %.1fs", result, time.perf_counter() - start)
+    await database.close_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--teams", required=True, help="teams .csv or .ndjson file")
+    parser.add_argument("--players", required=True, help="players .csv or .ndjson file")
+    args = parser.parse_args()
+    asyncio.run(load_data(args.teams, args.players))
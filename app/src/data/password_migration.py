@@ -0,0 +1,84 @@
+import asyncio
+
+from sqlalchemy import update as sql_update
+from sqlalchemy.future import select as sql_select
+
+from data.session import DatabaseSession, db
+from data.unit_of_work import UnitOfWork
+
+from models.team_model import Team
+import models.player_model  # noqa: F401
+
+from repository.team_repository import team_cache
+
+from utils.logger import logger_config
+from utils.security import SCRYPT_PREFIX, hash_password
+
+log = logger_config(__name__)
+
+
+async def migrate_plaintext_passwords(
+    database: DatabaseSession = db, batch_size: int = 500
+) -> int:
+    """
+    Hash every team password still stored in plaintext. Rows are migrated
+    lazily on login as well; this moves the remaining ones in batches.
+    Each batch is read, hashed outside any transaction and then written only
+    where the row still holds the plaintext that was read.
+    usage: python -m data.password_migration
+    """
+    migrated = 0
+    last_team_id = 0
+    while True:
+        uow = UnitOfWork(database)
+        try:
+            async with uow.session() as session:
+                stmt = (
+                    sql_select(Team.team_id, Team.team_name, Team.team_password)
+                    .where(
+                        Team.team_id > last_team_id,
+                        ~Team.team_password.startswith(f"{SCRYPT_PREFIX}$"),
+                    )
+                    .order_by(Team.team_id)
+                    .limit(batch_size)
+                )
+                teams = (await session.execute(stmt)).all()
+        finally:
+            await uow.close()
+        if not teams:
+            break
+        last_team_id = teams[-1].team_id
+
+        hashes = await asyncio.gather(
+            *(hash_password(team.team_password) for team in teams)
+        )
+
+        uow = UnitOfWork(database)
+        try:
+            async with uow.transaction():
+                async with uow.session() as session:
+                    for team, password_hash in zip(teams, hashes):
+                        # Skips rows changed since they were read, such as a
+                        # password migrated on login in the meantime.
+                        stmt = (
+                            sql_update(Team)
+                            .where(
+                                Team.team_id == team.team_id,
+                                Team.team_password == team.team_password,
+                            )
+                            .values(team_password=password_hash)
+                        )
+                        result = await session.execute(stmt)
+                        migrated += result.rowcount
+        finally:
+            await uow.close()
+        for team in teams:
+            team_cache.invalidate(team.team_name)
+        if len(teams) < batch_size:
+            break
+    log.info("Migrated %s plaintext team passwords", migrated)
+    return migrated
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate_plaintext_passwords())
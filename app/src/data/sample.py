@@ -2,22 +2,21 @@ from datetime import datetime
 import json
 import os
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import exists
 from sqlalchemy.future import select
-from faker import Faker
 from models.team_model import Team
 from models.player_model import Player
 from utils.logger import logger_config
+from utils.security import hash_password
 
 log = logger_config(__name__)
-faker = Faker()
 
 current_directory = os.path.dirname(os.path.abspath(__file__))
 
 
 async def insert_sample_data(session: AsyncSession, model, sample_data):
-    result = await session.execute(select(model))
-    records = result.scalars().all()
-    if not records:
+    result = await session.execute(select(exists().select_from(model)))
+    if not result.scalar():
         session.add_all(sample_data)
         await session.commit()
 
@@ -27,6 +26,7 @@ async def insert_sample_teams(session: AsyncSession):
         sample_teams = json.load(f)
     for team in sample_teams:
         team["created_at"] = datetime.fromisoformat(team["created_at"])
+        team["team_password"] = await hash_password(team["team_password"])
     teams = [Team(**team) for team in sample_teams]
     await insert_sample_data(session, Team, teams)
 
@@ -1,12 +1,19 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from contextlib import asynccontextmanager
 
-from typing import AsyncGenerator
+import itertools
+import time
+
+from typing import Any, AsyncGenerator, Dict, List, Optional
 
 from utils.logger import logger_config
+from utils.metrics import DB_POOL_WAIT, DB_QUERY_LATENCY
+from utils.profiling import record_span
 from utils.config import get_settings
 
 log = logger_config(__name__)
@@ -15,26 +22,134 @@ settings = get_settings()
 Base = declarative_base()
 
 
-class DatabaseSession:
-    def __init__(self):
-        self.engine = create_async_engine(
-            settings.SQLALCHEMY_DATABASE_URI,
-            echo=True,
-        )
+# Columns added after tables were first created; create_all does not alter
+# existing tables.
+SCHEMA_UPGRADES = [
+    "ALTER TABLE teams ADD COLUMN IF NOT EXISTS roster_version INTEGER NOT NULL DEFAULT 0",
+    "CREATE INDEX IF NOT EXISTS ix_outbox_delivered_at ON outbox (delivered_at) "
+    "WHERE delivered_at IS NOT NULL",
+]
 
-        self.SessionLocal = sessionmaker(
-            autocommit=False,
-            autoflush=False,
-            bind=self.engine,
-            class_=AsyncSession,
-            expire_on_commit=False,
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each checkout waits for a connection.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - start
+            self.wait_count += 1
+            self.wait_total += elapsed
+            self.wait_max = max(self.wait_max, elapsed)
+            DB_POOL_WAIT.observe(elapsed)
+            record_span("db.pool_wait", start, start + elapsed)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    end = time.perf_counter()
+    start = conn.info["query_start"]
+    kind = statement.split(None, 1)[0].upper()
+    DB_QUERY_LATENCY.labels(kind).observe(end - start)
+    record_span(f"db.{kind}", start, end)
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE
+        },
+    )
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
+
+
+def _create_sessionmaker(engine: AsyncEngine) -> sessionmaker:
+    return sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
+
+def _pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    pool = engine.pool
+    stats: Dict[str, Any] = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+    }
+    if isinstance(pool, TimedQueuePool):
+        stats.update(
+            {
+                "checkouts": pool.wait_count,
+                "wait_total_seconds": pool.wait_total,
+                "wait_avg_seconds": pool.wait_total / pool.wait_count
+                if pool.wait_count
+                else 0.0,
+                "wait_max_seconds": pool.wait_max,
+            }
         )
+    return stats
+
+
+class DatabaseSession:
+    def __init__(self):
+        self.engine = _create_engine(settings.SQLALCHEMY_DATABASE_URI)
+        self.SessionLocal = _create_sessionmaker(self.engine)
+
+        # Optional read replicas, used round-robin by read-only repository calls.
+        self.replica_engines: List[AsyncEngine] = [
+            _create_engine(url) for url in settings.SQLALCHEMY_REPLICA_URIS
+        ]
+        self.ReplicaSessionLocals = [
+            _create_sessionmaker(engine) for engine in self.replica_engines
+        ]
+        self._replica_cycle = itertools.cycle(self.ReplicaSessionLocals)
 
         self.metadata = Base.metadata
 
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self.ReplicaSessionLocals)
+
+    def replica_session(self) -> Optional[AsyncSession]:
+        if not self.has_replicas:
+            return None
+        return next(self._replica_cycle)()
+
     async def create_database(self):
         async with self.engine.begin() as conn:
             await conn.run_sync(self.metadata.create_all)
+            if conn.dialect.name == "postgresql":
+                for statement in SCHEMA_UPGRADES:
+                    await conn.execute(text(statement))
 
     async def drop_database(self):
         async with self.engine.begin() as conn:
@@ -42,6 +157,14 @@ class DatabaseSession:
 
     async def close_database(self):
         await self.engine.dispose()
+        for engine in self.replica_engines:
+            await engine.dispose()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        stats = _pool_stats(self.engine)
+        if self.replica_engines:
+            stats["replicas"] = [_pool_stats(engine) for engine in self.replica_engines]
+        return stats
 
     async def __aenter__(self) -> AsyncSession:
         self.db = self.SessionLocal()
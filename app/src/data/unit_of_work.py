@@ -0,0 +1,92 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from data.session import DatabaseSession, db
+from utils.logger import logger_config
+
+log = logger_config(__name__)
+
+
+class UnitOfWork:
+    """
+    Request-scoped unit of work. Lazily checks out a single session that every
+    repository call of the request shares, so an operation uses one pooled
+    connection and its writes are committed in one transaction.
+    Read-only calls go to a replica when one is configured, until the request
+    starts a transaction or writes; from then on it reads its own writes from
+    the primary.
+    usage: async with uow.transaction(): await TeamRepository.create(uow, team)
+    """
+
+    def __init__(self, database: DatabaseSession = db):
+        self.database = database
+        self._session: Optional[AsyncSession] = None
+        self._replica_session: Optional[AsyncSession] = None
+        self.primary_pinned = False
+        # Undo callbacks of backends that keep no session, run on rollback.
+        self._rollback_hooks: List[Callable[[], None]] = []
+        # AsyncSession does not allow concurrent operations, and sibling query
+        # fields of the same GraphQL operation are resolved concurrently.
+        self._lock = asyncio.Lock()
+
+    def on_rollback(self, hook: Callable[[], None]):
+        self._rollback_hooks.append(hook)
+
+    def _run_rollback_hooks(self):
+        while self._rollback_hooks:
+            self._rollback_hooks.pop()()
+
+    def use_primary(self):
+        self.primary_pinned = True
+
+    @asynccontextmanager
+    async def session(
+        self, readonly: bool = False
+    ) -> AsyncGenerator[AsyncSession, None]:
+        async with self._lock:
+            if readonly and not self.primary_pinned and self.database.has_replicas:
+                if self._replica_session is None:
+                    self._replica_session = self.database.replica_session()
+                yield self._replica_session
+            else:
+                if not readonly:
+                    self.primary_pinned = True
+                if self._session is None:
+                    self._session = self.database.SessionLocal()
+                yield self._session
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncGenerator["UnitOfWork", None]:
+        self.use_primary()
+        try:
+            yield self
+            await self.commit()
+        except Exception as e:
+            await self.rollback()
+            raise e
+
+    async def commit(self):
+        async with self._lock:
+            if self._session is not None:
+                await self._session.commit()
+            self._rollback_hooks.clear()
+
+    async def rollback(self):
+        async with self._lock:
+            if self._session is not None:
+                await self._session.rollback()
+            self._run_rollback_hooks()
+
+    async def close(self):
+        async with self._lock:
+            # Like closing a session, uncommitted work is discarded.
+            self._run_rollback_hooks()
+            if self._session is not None:
+                await self._session.close()
+                self._session = None
+            if self._replica_session is not None:
+                await self._replica_session.close()
+                self._replica_session = None
@@ -0,0 +1,107 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, Dict, Optional, Set
+
+from utils.logger import logger_config
+from utils.config import get_settings
+from utils.metrics import SUBSCRIPTION_EVENTS_DROPPED, SUBSCRIPTIONS_ACTIVE
+
+log = logger_config(__name__)
+settings = get_settings()
+
+
+class EventSubscription:
+    """
+    Bounded queue of events for one subscriber. When the subscriber falls
+    behind, the oldest queued event is dropped to make room for the newest.
+    """
+
+    def __init__(
+        self,
+        queue_size: int,
+        team_id: Optional[int] = None,
+        event_types: Optional[Set[str]] = None,
+    ):
+        self.team_id = team_id
+        self.event_types = event_types
+        self.dropped = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        return self.event_types is None or event["event_type"] in self.event_types
+
+    def put(self, event: Dict[str, Any]):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+            SUBSCRIPTION_EVENTS_DROPPED.inc()
+        self._queue.put_nowait(event)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        return await self._queue.get()
+
+
+class EventBus:
+    """
+    In-process fan-out of published events to GraphQL subscribers.
+    Subscribers are indexed by team so an event is only offered to the
+    subscribers of its team and to those listening to every team.
+    usage: async with event_bus.subscribe(team_id=1) as events:
+               async for event in events: ...
+    """
+
+    def __init__(self, queue_size: int = settings.SUBSCRIPTION_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.published = 0
+        self._subscribers: Dict[Optional[int], Set[EventSubscription]] = {}
+
+    @asynccontextmanager
+    async def subscribe(
+        self, team_id: Optional[int] = None, event_types: Optional[Set[str]] = None
+    ) -> AsyncGenerator[EventSubscription, None]:
+        subscription = EventSubscription(self.queue_size, team_id, event_types)
+        self._subscribers.setdefault(team_id, set()).add(subscription)
+        SUBSCRIPTIONS_ACTIVE.inc()
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers[team_id]
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[team_id]
+            SUBSCRIPTIONS_ACTIVE.dec()
+            if subscription.dropped:
+                log.warning(
+                    "Subscriber for team %s dropped %s events",
+                    team_id,
+                    subscription.dropped,
+                )
+
+    def publish(self, event: Dict[str, Any]) -> int:
+        self.published += 1
+        team_id = event["data"].get("team_id")
+        subscribers = self._subscribers.get(None, set())
+        if team_id is not None:
+            subscribers = subscribers | self._subscribers.get(team_id, set())
+        delivered = 0
+        for subscription in subscribers:
+            if subscription.matches(event):
+                subscription.put(event)
+                delivered += 1
+        return delivered
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "teams": len(
+                [team_id for team_id in self._subscribers if team_id is not None]
+            ),
+            "published": self.published,
+            "queue_size": self.queue_size,
+        }
+
+
+event_bus = EventBus()
@@ -0,0 +1,172 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from data.session import DatabaseSession, db
+from data.unit_of_work import UnitOfWork
+
+from events.event_bus import event_bus
+from events.publisher import Publisher, build_event
+
+from repository.base import OutboxRepositoryInterface
+from repository.outbox_repository import OutboxRepository
+
+from utils.logger import logger_config
+from utils.config import get_settings
+
+log = logger_config(__name__)
+settings = get_settings()
+
+# Delivered rows deleted per purge transaction.
+PURGE_BATCH_SIZE = 10000
+
+
+class OutboxRelay:
+    """
+    Background worker that drains pending outbox rows and publishes them.
+    Rows are claimed with FOR UPDATE SKIP LOCKED, so several replicas can
+    relay in parallel without publishing the same event twice.
+    Stopping relays the rows still pending, up to a timeout.
+    While the broker fails to confirm events, polling backs off exponentially
+    up to max_backoff seconds. Every purge_interval seconds, delivered rows
+    older than retention_hours are deleted; a retention of 0 keeps them.
+    usage: relay = OutboxRelay(publisher); relay.start(); ...; await relay.stop()
+    """
+
+    def __init__(
+        self,
+        publisher: Publisher,
+        database: DatabaseSession = db,
+        batch_size: int = settings.OUTBOX_BATCH_SIZE,
+        poll_interval: float = settings.OUTBOX_POLL_INTERVAL,
+        outbox_repository: Optional[OutboxRepositoryInterface] = None,
+        max_backoff: float = settings.OUTBOX_MAX_BACKOFF,
+        retention_hours: float = settings.OUTBOX_RETENTION_HOURS,
+        purge_interval: float = settings.OUTBOX_PURGE_INTERVAL,
+    ):
+        self.publisher = publisher
+        self.database = database
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.outbox_repository = outbox_repository or OutboxRepository()
+        self.max_backoff = max_backoff
+        self.retention_hours = retention_hours
+        self.purge_interval = purge_interval
+        self.consecutive_failures = 0
+        self._next_purge = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    async def relay_once(self) -> int:
+        """
+        Relays one batch and returns the number of events the broker confirmed.
+        """
+        uow = UnitOfWork(self.database)
+        try:
+            async with uow.transaction():
+                events = await self.outbox_repository.claim_pending(
+                    uow, self.batch_size
+                )
+                if not events:
+                    return 0
+                messages = [
+                    build_event(event.event_type, event.payload) for event in events
+                ]
+                delivered = await self.publisher.publish_batch(messages)
+                await self.outbox_repository.mark_delivered(
+                    uow,
+                    [
+                        event.outbox_id
+                        for event, confirmed in zip(events, delivered)
+                        if confirmed
+                    ],
+                )
+            # Subscribers only hear about events once they are marked delivered.
+            for message, confirmed in zip(messages, delivered):
+                if confirmed:
+                    event_bus.publish(message)
+            confirmed_count = sum(delivered)
+            if confirmed_count < len(events):
+                self.consecutive_failures += 1
+            else:
+                self.consecutive_failures = 0
+            return confirmed_count
+        finally:
+            await uow.close()
+
+    async def purge_once(self) -> int:
+        """
+        Deletes the delivered rows older than the retention, one batch per
+        transaction, and returns how many were deleted.
+        """
+        before = datetime.now(timezone.utc) - timedelta(hours=self.retention_hours)
+        purged = 0
+        while not self._stopping.is_set():
+            uow = UnitOfWork(self.database)
+            try:
+                async with uow.transaction():
+                    deleted = await self.outbox_repository.purge_delivered(
+                        uow, before, PURGE_BATCH_SIZE
+                    )
+            finally:
+                await uow.close()
+            purged += deleted
+            if deleted < PURGE_BATCH_SIZE:
+                break
+        if purged:
+            log.info("Purged %s delivered outbox events", purged)
+        return purged
+
+    async def run(self):
+        log.info("Outbox relay started (batch size %s)", self.batch_size)
+        while True:
+            try:
+                relayed = await self.relay_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error("Error relaying outbox events: %s", e)
+                self.consecutive_failures += 1
+                relayed = 0
+            if self.retention_hours > 0 and time.monotonic() >= self._next_purge:
+                self._next_purge = time.monotonic() + self.purge_interval
+                try:
+                    await self.purge_once()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    log.error("Error purging delivered outbox events: %s", e)
+            # A full batch means more rows are probably waiting.
+            if relayed < self.batch_size:
+                if self._stopping.is_set():
+                    # Pending rows have been relayed once more since stop().
+                    break
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.next_delay())
+                except asyncio.TimeoutError:
+                    pass
+
+    def next_delay(self) -> float:
+        if not self.consecutive_failures:
+            return self.poll_interval
+        return min(self.max_backoff, self.poll_interval * 2**self.consecutive_failures)
+
+    def start(self):
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self, timeout: Optional[float] = None):
+        if self._task is not None:
+            self._stopping.set()
+            try:
+                # wait_for cancels the relay if the batch is not done in time;
+                # its transaction then rolls back and the rows stay pending.
+                await asyncio.wait_for(self._task, timeout)
+            except asyncio.TimeoutError:
+                log.warning("Outbox relay did not finish its batch in time")
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            log.info("Outbox relay stopped")
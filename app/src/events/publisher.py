@@ -1,21 +1,131 @@
 import aio_pika  # type: ignore
 from aio_pika import ExchangeType, connect_robust
-import json
+import asyncio
+import msgpack  # type: ignore
+import orjson
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+
+from events.event_bus import event_bus
 
 from utils.logger import logger_config
+from utils.metrics import (
+    EVENT_PUBLISH_FAILURES,
+    EVENT_PUBLISH_LATENCY,
+    EVENTS_PUBLISHED,
+)
 from utils.config import get_settings
+from utils.profiling import profiled
 
 log = logger_config(__name__)
 settings = get_settings()
 
 
-class DateTimeEncoder(json.JSONEncoder):
-    def default(self, obj: Any) -> str:
+class EventCodec(ABC):
+    name: str = ""
+    content_type: str = ""
+
+    @abstractmethod
+    def encode(self, event: Dict[str, Any]) -> bytes: ...
+
+    @abstractmethod
+    def decode(self, body: bytes) -> Dict[str, Any]: ...
+
+
+class JsonCodec(EventCodec):
+    name = "json"
+    content_type = "application/json"
+
+    def encode(self, event: Dict[str, Any]) -> bytes:
+        # orjson serializes datetimes natively as RFC 3339 strings.
+        return orjson.dumps(event)
+
+    def decode(self, body: bytes) -> Dict[str, Any]:
+        return orjson.loads(body)
+
+
+class MsgpackCodec(EventCodec):
+    name = "msgpack"
+    content_type = "application/msgpack"
+
+    @staticmethod
+    def _default(obj: Any) -> Any:
         if isinstance(obj, datetime):
             return obj.isoformat()
-        return super().default(obj)
+        raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+    def encode(self, event: Dict[str, Any]) -> bytes:
+        return msgpack.packb(event, default=self._default, use_bin_type=True)
+
+    def decode(self, body: bytes) -> Dict[str, Any]:
+        return msgpack.unpackb(body, raw=False)
+
+
+CODECS = {codec.name: codec for codec in (JsonCodec, MsgpackCodec)}
+
+
+def get_codec(name: str = settings.EVENT_CODEC) -> EventCodec:
+    if name not in CODECS:
+        raise ValueError(f"Unknown event codec {name}")
+    return CODECS[name]()
+
+
+class ChannelPool:
+    """
+    Fixed-size pool of AMQP channels, each with its own exchange handle.
+    Closed channels are reopened when they are next acquired.
+    usage: async with pool.acquire() as exchange: await exchange.publish(...)
+    """
+
+    def __init__(
+        self,
+        connection: aio_pika.RobustConnection,
+        exchange_name: str,
+        size: int,
+    ):
+        self.connection = connection
+        self.exchange_name = exchange_name
+        self.size = size
+        self.reopened = 0
+        self._free: asyncio.Queue = asyncio.Queue()
+
+    async def open(self):
+        for _ in range(self.size):
+            self._free.put_nowait(await self._open_slot())
+
+    async def _open_slot(self) -> Tuple[Any, Any]:
+        channel = await self.connection.channel(publisher_confirms=True)
+        exchange = await channel.declare_exchange(
+            self.exchange_name, ExchangeType.FANOUT, durable=True
+        )
+        return channel, exchange
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncGenerator[Any, None]:
+        slot = await self._free.get()
+        try:
+            channel, exchange = slot
+            if channel.is_closed:
+                log.warning("Reopening closed channel for %s", self.exchange_name)
+                slot = await self._open_slot()
+                channel, exchange = slot
+                self.reopened += 1
+            yield exchange
+        finally:
+            self._free.put_nowait(slot)
+
+    @property
+    def available(self) -> int:
+        return self._free.qsize()
+
+    async def close(self):
+        while not self._free.empty():
+            channel, _ = self._free.get_nowait()
+            if not channel.is_closed:
+                await channel.close()
 
 
 class Publisher:
@@ -23,35 +133,176 @@ class Publisher:
         self,
         connection: aio_pika.RobustConnection,
         exchange_name: str = settings.EXCHANGE_NAME,
+        buffered: bool = settings.PUBLISHER_BUFFERED,
+        queue_size: int = settings.PUBLISHER_QUEUE_SIZE,
+        batch_size: int = settings.PUBLISHER_BATCH_SIZE,
+        overflow_policy: str = settings.PUBLISHER_OVERFLOW_POLICY,
+        channel_pool_size: int = settings.PUBLISHER_CHANNEL_POOL_SIZE,
+        codec: Optional[EventCodec] = None,
     ):
+        if overflow_policy not in ("block", "drop"):
+            raise ValueError(f"Unknown publisher overflow policy {overflow_policy}")
         self.exchange_name = exchange_name
         self.connection = connection
-        self.channel = None
-        self.exchange = None
+        self.channel_pool_size = channel_pool_size
+        self.channel_pool: Optional[ChannelPool] = None
+        self.codec = codec or get_codec()
+        self.buffered = buffered
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.overflow_policy = overflow_policy
+        self.published = 0
+        self.failed = 0
+        self.dropped = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._flush_tasks: List[asyncio.Task] = []
 
     async def connect(self):
-        self.channel = await self.connection.channel()
-        await self._declare_exchange()
-        log.info(f"Connected to exchange {self.exchange_name}")
-
-    async def _declare_exchange(self):
-        self.exchange = await self.channel.declare_exchange(
-            self.exchange_name, ExchangeType.FANOUT, durable=True
+        channel_pool = ChannelPool(
+            self.connection, self.exchange_name, self.channel_pool_size
+        )
+        await channel_pool.open()
+        self.channel_pool = channel_pool
+        log.info(
+            "Connected to exchange %s with %s channels",
+            self.exchange_name,
+            self.channel_pool_size,
         )
+        if self.buffered:
+            self.start()
+
+    def start(self):
+        if not self._flush_tasks:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            # One flusher per pooled channel so batches are confirmed in parallel.
+            self._flush_tasks = [
+                asyncio.create_task(self._flush_loop())
+                for _ in range(self.channel_pool_size)
+            ]
+            log.info(
+                "Buffered publishing enabled (queue size %s, batch size %s, overflow policy %s)",
+                self.queue_size,
+                self.batch_size,
+                self.overflow_policy,
+            )
 
+    @profiled("Publisher.publish")
     async def publish(self, message: Dict[str, Any]):
-        if not self.exchange:
+        if not self.channel_pool:
             raise ConnectionError("Exchange is not initialized. Call connect() first.")
-        await self.exchange.publish(
-            aio_pika.Message(body=json.dumps(message, cls=DateTimeEncoder).encode()),
-            routing_key="",
+        if self._queue is None:
+            delivered = await self.publish_batch([message])
+            if not delivered[0]:
+                raise ConnectionError(
+                    f"Message was not confirmed by exchange {self.exchange_name}"
+                )
+            return
+        if self.overflow_policy == "drop":
+            try:
+                self._queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                log.warning(
+                    "Publisher queue full, dropped message for exchange %s: %s",
+                    self.exchange_name,
+                    message,
+                )
+        else:
+            await self._queue.put(message)
+
+    async def publish_batch(self, messages: List[Dict[str, Any]]) -> List[bool]:
+        # The channel runs with publisher confirms, so each publish resolves once
+        # the broker acknowledges it; gathering waits for the batch's confirms together.
+        async with self.channel_pool.acquire() as exchange:
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(
+                    exchange.publish(self._build_message(message), routing_key="")
+                    for message in messages
+                ),
+                return_exceptions=True,
+            )
+            EVENT_PUBLISH_LATENCY.observe(time.perf_counter() - start)
+        delivered = []
+        for message, result in zip(messages, results):
+            if isinstance(result, BaseException):
+                self.failed += 1
+                EVENT_PUBLISH_FAILURES.inc()
+                delivered.append(False)
+                log.error(
+                    "Failed to publish message to exchange %s: %s",
+                    self.exchange_name,
+                    result,
+                )
+            else:
+                self.published += 1
+                EVENTS_PUBLISHED.inc()
+                delivered.append(True)
+                log.info(
+                    "Published message to exchange %s: %s", self.exchange_name, message
+                )
+        return delivered
+
+    def _build_message(self, message: Dict[str, Any]) -> aio_pika.Message:
+        return aio_pika.Message(
+            body=self.codec.encode(message),
+            content_type=self.codec.content_type,
+            headers={"schema_version": settings.EVENT_SCHEMA_VERSION},
         )
-        log.info(f"Published message to exchange {self.exchange_name}: {message}")
 
-    async def close(self):
+    async def _flush_loop(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self.publish_batch(batch)
+            except Exception as e:
+                log.error("Unexpected error flushing publisher queue: %s", e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def flush(self, timeout: Optional[float] = None):
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            log.warning(
+                "Timed out flushing publisher queue, %s messages pending",
+                self._queue.qsize(),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "buffered": self._queue is not None,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_size": self.queue_size,
+            "published": self.published,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "channels": self.channel_pool_size,
+            "channels_available": self.channel_pool.available
+            if self.channel_pool
+            else 0,
+            "channels_reopened": self.channel_pool.reopened if self.channel_pool else 0,
+        }
+
+    async def close(self, flush: bool = True):
+        if self._flush_tasks:
+            if flush:
+                await self.flush(settings.PUBLISHER_FLUSH_TIMEOUT)
+            for task in self._flush_tasks:
+                task.cancel()
+            self._flush_tasks = []
+            self._queue = None
+        if self.channel_pool:
+            await self.channel_pool.close()
+            self.channel_pool = None
         if self.connection:
             await self.connection.close()
-            log.info(f"Connection to exchange {self.exchange_name} closed")
+            log.info("Connection to exchange %s closed", self.exchange_name)
 
 
 async def start_publisher(loop):
@@ -69,9 +320,14 @@ async def start_publisher(loop):
     return publisher
 
 
+def build_event(event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    return {"event_type": event_type, "data": data}
+
+
 async def publish_event(
     publisher: Publisher, event_type: str, data: Dict[str, Any]
 ) -> bool:
-    event = {"event_type": event_type, "data": data}
+    event = build_event(event_type, data)
     await publisher.publish(event)
+    event_bus.publish(event)
     return True
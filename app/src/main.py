@@ -1,15 +1,28 @@
 import uvicorn
 import asyncio
+import os
+import tempfile
+import time
 
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+from typing import AsyncGenerator, Optional
+
+from fastapi import FastAPI
+from starlette.requests import HTTPConnection
 from fastapi.middleware.cors import CORSMiddleware
 
-from data.sample import insert_sample_teams, insert_sample_players
 from data.session import db
+from data.unit_of_work import UnitOfWork
+
+from events.publisher import Publisher, start_publisher
+from events.outbox_relay import OutboxRelay
+
+from resolver.extensions import MetricsExtension
+from resolver.loaders import create_loaders
 
-from events.publisher import start_publisher
+from service.api_gateway_client import ApiGatewayClient
+from service.team_service import create_team_service
 
 from routes.graphql_router import graphql_app, graphql_router
 from routes.health_router import health_router
@@ -20,25 +33,109 @@ from utils.config import get_settings
 log = logger_config(__name__)
 settings = get_settings()
 
+# Set by run_server once the schema exists and the sample data is seeded, so
+# the workers it starts do not race each other doing both on a fresh database.
+DATABASE_PREPARED_ENV = "DATABASE_PREPARED"
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    loop = asyncio.get_event_loop()
-    publisher_connection = await start_publisher(loop)
+
+async def seed_sample_data():
+    # Deferred so the sample loader and its data files stay off the startup path.
+    from data.sample import insert_sample_teams, insert_sample_players
+
+    start = time.perf_counter()
     try:
-        await db.create_database()
         async with db.get_db() as session:
             await insert_sample_teams(session)
             await insert_sample_players(session)
+        log.info("Sample data seeded in %.3fs", time.perf_counter() - start)
+    except Exception:
+        log.exception("Error seeding sample data")
+
+
+async def prepare_database():
+    await db.create_database()
+    if settings.SEED_SAMPLE_DATA:
+        await seed_sample_data()
+    await db.close_database()
+
+
+async def drain(
+    outbox_relay: OutboxRelay,
+    publisher: Publisher,
+    timeout: float = settings.SHUTDOWN_DRAIN_TIMEOUT,
+):
+    # In-flight operations, the outbox batch being relayed and the buffered
+    # publishes all have to finish within one deadline.
+    start = time.perf_counter()
+    deadline = time.monotonic() + timeout
+    while MetricsExtension.in_flight and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    if MetricsExtension.in_flight:
+        log.warning(
+            "Shutting down with %s operations in flight", MetricsExtension.in_flight
+        )
+    await outbox_relay.stop(max(0.0, deadline - time.monotonic()))
+    await publisher.flush(max(0.0, deadline - time.monotonic()))
+    log.info("Drained in %.3fs", time.perf_counter() - start)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start = time.perf_counter()
+    app.state.ready = False
+    loop = asyncio.get_event_loop()
+    team_service = create_team_service()
+    # The sample loader writes through SQL sessions, not the repositories.
+    prepare = (
+        settings.REPOSITORY_BACKEND == "sql"
+        and os.environ.get(DATABASE_PREPARED_ENV) != "1"
+    )
+    # Broker connection and schema creation do not depend on each other.
+    startup = [start_publisher(loop)]
+    if prepare:
+        startup.append(db.create_database())
+    publisher_connection, *_ = await asyncio.gather(*startup)
+    outbox_relay = OutboxRelay(
+        publisher_connection, outbox_repository=team_service.outbox_repository
+    )
+    api_gateway_client = ApiGatewayClient()
+    seed_task: Optional[asyncio.Task] = None
+    try:
         app.state.publisher_connection = publisher_connection
+        app.state.api_gateway_client = api_gateway_client
+        app.state.team_service = team_service
+        outbox_relay.start()
+        if prepare and settings.SEED_SAMPLE_DATA:
+            seed_task = asyncio.create_task(seed_sample_data())
+        app.state.startup_seconds = time.perf_counter() - start
+        app.state.ready = True
+        log.info("Application ready in %.3fs", app.state.startup_seconds)
         yield
     finally:
-        await publisher_connection.close()
+        app.state.ready = False
+        if seed_task is not None and not seed_task.done():
+            seed_task.cancel()
+        await drain(outbox_relay, publisher_connection)
+        await api_gateway_client.close()
+        # drain() has already flushed the publisher within its deadline.
+        await publisher_connection.close(flush=False)
         await db.close_database()
 
 
-async def get_context(request: Request) -> dict:
-    return {"publisher": request.app.state.publisher_connection}
+async def get_context(request: HTTPConnection) -> AsyncGenerator[dict, None]:
+    # HTTPConnection covers both HTTP requests and subscription websockets.
+    uow = UnitOfWork(db)
+    team_service = request.app.state.team_service
+    try:
+        yield {
+            "publisher": request.app.state.publisher_connection,
+            "api_gateway": request.app.state.api_gateway_client,
+            "team_service": team_service,
+            "uow": uow,
+            **create_loaders(uow, team_service),
+        }
+    finally:
+        await uow.close()
 
 
 def init_app():
@@ -97,7 +194,48 @@ def init_app():
     return app
 
 
+def worker_count() -> int:
+    if settings.APP_WORKERS > 0:
+        return settings.APP_WORKERS
+    # CPUs this process may run on, which respects container CPU sets.
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    # Every worker opens its own database pool and broker connection.
+    return max(1, min(cpus, settings.APP_WORKERS_MAX))
+
+
+def run_server():
+    if settings.DEBUG:
+        uvicorn.run(
+            settings.APP_MODULE,
+            host=settings.APP_HOST,
+            port=settings.APP_PORT,
+            reload=True,
+        )
+        return
+    workers = worker_count()
+    if workers > 1 and "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        # Read by prometheus_client when each worker imports it, so /metrics
+        # can aggregate all workers.
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+    if workers > 1 and settings.REPOSITORY_BACKEND == "sql":
+        asyncio.run(prepare_database())
+        os.environ[DATABASE_PREPARED_ENV] = "1"
+    log.info("Starting %s workers", workers)
+    # On SIGTERM uvicorn stops accepting connections and waits for open
+    # requests before running the lifespan shutdown, which drains the rest.
+    uvicorn.run(
+        settings.APP_MODULE,
+        host=settings.APP_HOST,
+        port=settings.APP_PORT,
+        workers=workers,
+        timeout_graceful_shutdown=int(settings.SHUTDOWN_DRAIN_TIMEOUT),
+    )
+
+
 app = init_app()
 
 if __name__ == "__main__":
-    uvicorn.run(app, host=settings.APP_HOST, port=settings.APP_PORT, reload=True)
+    run_server()
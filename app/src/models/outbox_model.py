@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
+from datetime import datetime, timezone
+
+from data.session import Base
+
+
+class Outbox(Base):
+    __tablename__ = "outbox"
+
+    outbox_id = Column(Integer, primary_key=True, autoincrement=True)
+    event_type = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    delivered_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_outbox_pending",
+            "outbox_id",
+            postgresql_where=delivered_at.is_(None),
+        ),
+        Index(
+            "ix_outbox_delivered_at",
+            "delivered_at",
+            postgresql_where=delivered_at.is_not(None),
+        ),
+    )
+
+    def to_dict(self):
+        return {
+            "outbox_id": self.outbox_id,
+            "event_type": self.event_type,
+            "payload": self.payload,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "delivered_at": self.delivered_at.isoformat()
+            if self.delivered_at
+            else None,
+        }
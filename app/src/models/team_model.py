@@ -11,6 +11,8 @@ class Team(Base):
     team_id = Column(Integer, primary_key=True, autoincrement=True)
     team_name = Column(String, index=True, unique=True)
     team_password = Column(String)
+    # Bumped whenever the team's players change, used for roster ETags.
+    roster_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
@@ -20,6 +22,5 @@ class Team(Base):
         return {
             "team_id": self.team_id,
             "team_name": self.team_name,
-            "team_password": self.team_password,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
@@ -0,0 +1,102 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from data.unit_of_work import UnitOfWork
+from models.outbox_model import Outbox
+from models.player_model import Player
+from models.team_model import Team
+
+
+class TeamRepositoryInterface(ABC):
+    @abstractmethod
+    async def create(self, uow: UnitOfWork, team_data: Team) -> Team: ...
+
+    @abstractmethod
+    async def create_many(self, uow: UnitOfWork, teams: list[dict]) -> list[Team]: ...
+
+    @abstractmethod
+    async def update_password(
+        self, uow: UnitOfWork, team_id: int, team_name: str, password_hash: str
+    ) -> None: ...
+
+    @abstractmethod
+    async def get_by_name(self, uow: UnitOfWork, team_name: str) -> Optional[Team]: ...
+
+    @abstractmethod
+    async def get_by_names(
+        self, uow: UnitOfWork, team_names: list[str]
+    ) -> list[Team]: ...
+
+    @abstractmethod
+    async def get_roster_version(
+        self, uow: UnitOfWork, team_name: str
+    ) -> Optional[int]: ...
+
+    @abstractmethod
+    async def get_by_id(self, uow: UnitOfWork, team_id: int) -> Optional[Team]: ...
+
+    @abstractmethod
+    async def team_exists_by_name(self, uow: UnitOfWork, team_name: str) -> bool: ...
+
+
+class PlayerRepositoryInterface(ABC):
+    @abstractmethod
+    async def create(self, uow: UnitOfWork, player_data: Player) -> Player: ...
+
+    @abstractmethod
+    async def create_many(
+        self, uow: UnitOfWork, players: list[dict]
+    ) -> list[Player]: ...
+
+    @abstractmethod
+    async def get_by_name(
+        self, uow: UnitOfWork, player_name: str
+    ) -> Optional[Player]: ...
+
+    @abstractmethod
+    async def player_exists_by_name_in_team(
+        self, uow: UnitOfWork, player_name: str, team_id: int
+    ) -> bool: ...
+
+    @abstractmethod
+    async def get_existing_names_in_team(
+        self, uow: UnitOfWork, player_names: list[str], team_id: int
+    ) -> set[str]: ...
+
+    @abstractmethod
+    async def get_players(
+        self,
+        uow: UnitOfWork,
+        team_id: int,
+        limit: int,
+        after_id: Optional[int] = None,
+    ) -> list[Player]: ...
+
+    @abstractmethod
+    async def get_players_by_team_ids(
+        self, uow: UnitOfWork, team_ids: list[int], limit_per_team: int
+    ) -> list[Player]: ...
+
+
+class OutboxRepositoryInterface(ABC):
+    @abstractmethod
+    async def add(
+        self, uow: UnitOfWork, event_type: str, data: Dict[str, Any]
+    ) -> Outbox: ...
+
+    @abstractmethod
+    async def add_many(
+        self, uow: UnitOfWork, event_type: str, data: list[Dict[str, Any]]
+    ) -> list[Outbox]: ...
+
+    @abstractmethod
+    async def claim_pending(self, uow: UnitOfWork, limit: int) -> list[Outbox]: ...
+
+    @abstractmethod
+    async def mark_delivered(self, uow: UnitOfWork, outbox_ids: list[int]) -> None: ...
+
+    @abstractmethod
+    async def purge_delivered(
+        self, uow: UnitOfWork, before: datetime, limit: int
+    ) -> int: ...
@@ -0,0 +1,246 @@
+import itertools
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from models.outbox_model import Outbox
+from models.player_model import Player
+from models.team_model import Team
+from data.unit_of_work import UnitOfWork
+from repository.base import (
+    OutboxRepositoryInterface,
+    PlayerRepositoryInterface,
+    TeamRepositoryInterface,
+)
+from utils.logger import logger_config
+
+log = logger_config(__name__)
+
+
+class InMemoryStore:
+    """
+    Dict and index based storage shared by the in-memory repositories.
+    Writes are applied immediately and undone through the unit of work when
+    its transaction rolls back or it is closed without committing.
+    usage: store = InMemoryStore(); TeamService(InMemoryTeamRepository(store), ...)
+    """
+
+    def __init__(self):
+        self.teams: Dict[int, Team] = {}
+        self.team_ids_by_name: Dict[str, int] = {}
+        self.players: Dict[int, Player] = {}
+        # Player ids per team in insertion order, which is also id order.
+        self.player_ids_by_team: Dict[int, List[int]] = {}
+        self.player_names_by_team: Dict[int, Set[str]] = {}
+        self.outbox: Dict[int, Outbox] = {}
+        self.team_ids = itertools.count(1)
+        self.player_ids = itertools.count(1)
+        self.outbox_ids = itertools.count(1)
+
+
+class InMemoryTeamRepository(TeamRepositoryInterface):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def create(self, uow: UnitOfWork, team_data: Team) -> Team:
+        store = self.store
+        if team_data.team_name in store.team_ids_by_name:
+            raise ValueError(f"Team with name {team_data.team_name} already exists")
+        team_data.team_id = next(store.team_ids)
+        team_data.roster_version = 0
+        store.teams[team_data.team_id] = team_data
+        store.team_ids_by_name[team_data.team_name] = team_data.team_id
+
+        def undo():
+            del store.teams[team_data.team_id]
+            del store.team_ids_by_name[team_data.team_name]
+
+        uow.on_rollback(undo)
+        log.info("Team created in repository: %s", team_data.team_id)
+        return team_data
+
+    async def create_many(self, uow: UnitOfWork, teams: list[dict]) -> list[Team]:
+        # Validate the whole batch first so it is inserted all or nothing.
+        names = [team["team_name"] for team in teams]
+        duplicates = [
+            name
+            for name in names
+            if name in self.store.team_ids_by_name or names.count(name) > 1
+        ]
+        if duplicates:
+            raise ValueError(f"Team with name {duplicates[0]} already exists")
+        return [await self.create(uow, Team(**team)) for team in teams]
+
+    async def update_password(
+        self, uow: UnitOfWork, team_id: int, team_name: str, password_hash: str
+    ) -> None:
+        team = self.store.teams.get(team_id)
+        if team is None:
+            return
+        previous = team.team_password
+        team.team_password = password_hash
+
+        def undo():
+            team.team_password = previous
+
+        uow.on_rollback(undo)
+        log.info("Team password updated in repository for team %s", team_id)
+
+    async def get_by_name(self, uow: UnitOfWork, team_name: str) -> Optional[Team]:
+        team_id = self.store.team_ids_by_name.get(team_name)
+        return self.store.teams[team_id] if team_id is not None else None
+
+    async def get_by_names(self, uow: UnitOfWork, team_names: list[str]) -> list[Team]:
+        ids = self.store.team_ids_by_name
+        return [self.store.teams[ids[name]] for name in set(team_names) if name in ids]
+
+    async def get_roster_version(
+        self, uow: UnitOfWork, team_name: str
+    ) -> Optional[int]:
+        team = await self.get_by_name(uow, team_name)
+        return team.roster_version if team is not None else None
+
+    async def get_by_id(self, uow: UnitOfWork, team_id: int) -> Optional[Team]:
+        return self.store.teams.get(team_id)
+
+    async def team_exists_by_name(self, uow: UnitOfWork, team_name: str) -> bool:
+        return team_name in self.store.team_ids_by_name
+
+
+class InMemoryPlayerRepository(PlayerRepositoryInterface):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def create(self, uow: UnitOfWork, player_data: Player) -> Player:
+        store = self.store
+        if player_data.team_id not in store.teams:
+            raise ValueError(f"Team with id {player_data.team_id} does not exist")
+        player_data.player_id = next(store.player_ids)
+        store.players[player_data.player_id] = player_data
+        store.player_ids_by_team.setdefault(player_data.team_id, []).append(
+            player_data.player_id
+        )
+        store.player_names_by_team.setdefault(player_data.team_id, set()).add(
+            player_data.player_name
+        )
+        # Versions only move forward, even when the insert is rolled back.
+        store.teams[player_data.team_id].roster_version += 1
+
+        def undo():
+            del store.players[player_data.player_id]
+            store.player_ids_by_team[player_data.team_id].remove(player_data.player_id)
+            store.player_names_by_team[player_data.team_id].discard(
+                player_data.player_name
+            )
+
+        uow.on_rollback(undo)
+        log.info("Player created in repository: %s", player_data.player_id)
+        return player_data
+
+    async def create_many(self, uow: UnitOfWork, players: list[dict]) -> list[Player]:
+        missing = [
+            player["team_id"]
+            for player in players
+            if player["team_id"] not in self.store.teams
+        ]
+        if missing:
+            raise ValueError(f"Team with id {missing[0]} does not exist")
+        return [await self.create(uow, Player(**player)) for player in players]
+
+    async def get_by_name(self, uow: UnitOfWork, player_name: str) -> Optional[Player]:
+        return next(
+            (
+                player
+                for player in self.store.players.values()
+                if player.player_name == player_name
+            ),
+            None,
+        )
+
+    async def player_exists_by_name_in_team(
+        self, uow: UnitOfWork, player_name: str, team_id: int
+    ) -> bool:
+        return player_name in self.store.player_names_by_team.get(team_id, ())
+
+    async def get_existing_names_in_team(
+        self, uow: UnitOfWork, player_names: list[str], team_id: int
+    ) -> set[str]:
+        return self.store.player_names_by_team.get(team_id, set()).intersection(
+            player_names
+        )
+
+    async def get_players(
+        self,
+        uow: UnitOfWork,
+        team_id: int,
+        limit: int,
+        after_id: Optional[int] = None,
+    ) -> list[Player]:
+        player_ids = self.store.player_ids_by_team.get(team_id, [])
+        if after_id is not None:
+            player_ids = [player_id for player_id in player_ids if player_id > after_id]
+        return [self.store.players[player_id] for player_id in player_ids[:limit]]
+
+    async def get_players_by_team_ids(
+        self, uow: UnitOfWork, team_ids: list[int], limit_per_team: int
+    ) -> list[Player]:
+        players = [
+            self.store.players[player_id]
+            for team_id in set(team_ids)
+            for player_id in self.store.player_ids_by_team.get(team_id, [])[
+                :limit_per_team
+            ]
+        ]
+        return sorted(players, key=lambda player: player.player_id)
+
+
+class InMemoryOutboxRepository(OutboxRepositoryInterface):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def add(
+        self, uow: UnitOfWork, event_type: str, data: Dict[str, Any]
+    ) -> Outbox:
+        store = self.store
+        event = Outbox(
+            outbox_id=next(store.outbox_ids),
+            event_type=event_type,
+            payload=data,
+            created_at=datetime.now(timezone.utc),
+        )
+        store.outbox[event.outbox_id] = event
+        uow.on_rollback(lambda: store.outbox.pop(event.outbox_id))
+        log.info("Event %s added to outbox: %s", event_type, data)
+        return event
+
+    async def add_many(
+        self, uow: UnitOfWork, event_type: str, data: list[Dict[str, Any]]
+    ) -> list[Outbox]:
+        return [await self.add(uow, event_type, item) for item in data]
+
+    async def claim_pending(self, uow: UnitOfWork, limit: int) -> list[Outbox]:
+        # Delivered events are dropped, so every stored event is pending.
+        pending = sorted(self.store.outbox)[:limit]
+        return [self.store.outbox[outbox_id] for outbox_id in pending]
+
+    async def mark_delivered(self, uow: UnitOfWork, outbox_ids: list[int]) -> None:
+        now = datetime.now(timezone.utc)
+        delivered = [
+            self.store.outbox.pop(outbox_id)
+            for outbox_id in outbox_ids
+            if outbox_id in self.store.outbox
+        ]
+        for event in delivered:
+            event.delivered_at = now
+
+        def undo():
+            for event in delivered:
+                event.delivered_at = None
+                self.store.outbox[event.outbox_id] = event
+
+        uow.on_rollback(undo)
+
+    async def purge_delivered(
+        self, uow: UnitOfWork, before: datetime, limit: int
+    ) -> int:
+        # Delivered events are already dropped by mark_delivered.
+        return 0
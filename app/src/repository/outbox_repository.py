@@ -0,0 +1,95 @@
+from datetime import datetime, timezone
+from typing import Any, Dict
+from sqlalchemy import (
+    ARRAY,
+    Integer,
+    any_,
+    bindparam,
+    delete as sql_delete,
+    update as sql_update,
+)
+from sqlalchemy.future import select as sql_select
+from models.outbox_model import Outbox
+from data.unit_of_work import UnitOfWork
+from repository.base import OutboxRepositoryInterface
+from utils.logger import logger_config
+from utils.profiling import profiled
+
+log = logger_config(__name__)
+
+
+class OutboxRepository(OutboxRepositoryInterface):
+    @staticmethod
+    @profiled("OutboxRepository.add")
+    async def add(uow: UnitOfWork, event_type: str, data: Dict[str, Any]) -> Outbox:
+        async with uow.session() as session:
+            event = Outbox(
+                event_type=event_type,
+                payload=data,
+                created_at=datetime.now(timezone.utc),
+            )
+            session.add(event)
+            log.info("Event %s added to outbox: %s", event_type, data)
+        return event
+
+    @staticmethod
+    @profiled("OutboxRepository.add_many")
+    async def add_many(
+        uow: UnitOfWork, event_type: str, data: list[Dict[str, Any]]
+    ) -> list[Outbox]:
+        created_at = datetime.now(timezone.utc)
+        async with uow.session() as session:
+            events = [
+                Outbox(event_type=event_type, payload=item, created_at=created_at)
+                for item in data
+            ]
+            session.add_all(events)
+            log.info("%s %s events added to outbox", len(events), event_type)
+        return events
+
+    @staticmethod
+    @profiled("OutboxRepository.claim_pending")
+    async def claim_pending(uow: UnitOfWork, limit: int) -> list[Outbox]:
+        async with uow.session() as session:
+            stmt = (
+                sql_select(Outbox)
+                .where(Outbox.delivered_at.is_(None))
+                .order_by(Outbox.outbox_id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            result = await session.execute(stmt)
+            events = result.scalars().all()
+            return list(events)
+
+    @staticmethod
+    @profiled("OutboxRepository.mark_delivered")
+    async def mark_delivered(uow: UnitOfWork, outbox_ids: list[int]) -> None:
+        if not outbox_ids:
+            return
+        async with uow.session() as session:
+            stmt = (
+                sql_update(Outbox)
+                .where(
+                    Outbox.outbox_id
+                    == any_(bindparam("outbox_ids", outbox_ids, type_=ARRAY(Integer)))
+                )
+                .values(delivered_at=datetime.now(timezone.utc))
+            )
+            await session.execute(stmt)
+
+    @staticmethod
+    @profiled("OutboxRepository.purge_delivered")
+    async def purge_delivered(uow: UnitOfWork, before: datetime, limit: int) -> int:
+        # Deleted in bounded batches so a purge never holds many row locks.
+        async with uow.session() as session:
+            batch = (
+                sql_select(Outbox.outbox_id)
+                .where(Outbox.delivered_at < before)
+                .limit(limit)
+                .scalar_subquery()
+            )
+            result = await session.execute(
+                sql_delete(Outbox).where(Outbox.outbox_id.in_(batch))
+            )
+            return result.rowcount
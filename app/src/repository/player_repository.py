@@ -1,37 +1,75 @@
 from typing import Optional
+from sqlalchemy import (
+    ARRAY,
+    Integer,
+    String,
+    any_,
+    bindparam,
+    func,
+    insert as sql_insert,
+    update as sql_update,
+)
 from sqlalchemy.future import select as sql_select
 from models.player_model import Player
-from data.session import db
+from models.team_model import Team
+from data.unit_of_work import UnitOfWork
+from repository.base import PlayerRepositoryInterface
 from utils.logger import logger_config
+from utils.profiling import profiled
 
 log = logger_config(__name__)
 
 
-class PlayerRepository:
+def _bump_roster_version(team_ids: set[int]):
+    return (
+        sql_update(Team)
+        .where(Team.team_id.in_(team_ids))
+        .values(roster_version=Team.roster_version + 1)
+    )
+
+
+class PlayerRepository(PlayerRepositoryInterface):
     @staticmethod
-    async def create(player_data: Player) -> Player:
-        async with db.get_db() as session:
-            async with db.commit_rollback(session):
-                session.add(player_data)
-                await session.flush()
-                await session.refresh(player_data)
-                log.info(f"Player created in repository: {player_data.to_dict()}")
+    @profiled("PlayerRepository.create")
+    async def create(uow: UnitOfWork, player_data: Player) -> Player:
+        async with uow.session() as session:
+            session.add(player_data)
+            await session.flush()
+            await session.execute(_bump_roster_version({player_data.team_id}))
+            log.info("Player created in repository: %s", player_data.player_id)
         return player_data
 
     @staticmethod
-    async def get_by_name(player_name: str) -> Optional[Player]:
-        async with db.get_db() as session:
+    @profiled("PlayerRepository.create_many")
+    async def create_many(uow: UnitOfWork, players: list[dict]) -> list[Player]:
+        async with uow.session() as session:
+            stmt = sql_insert(Player).values(players).returning(Player)
+            result = await session.execute(stmt)
+            created = list(result.scalars().all())
+            if created:
+                await session.execute(
+                    _bump_roster_version({player.team_id for player in created})
+                )
+            log.info("%s players created in repository", len(created))
+        return created
+
+    @staticmethod
+    @profiled("PlayerRepository.get_by_name")
+    async def get_by_name(uow: UnitOfWork, player_name: str) -> Optional[Player]:
+        async with uow.session(readonly=True) as session:
             stmt = sql_select(Player).where(Player.player_name == player_name)
             result = await session.execute(stmt)
             player = result.scalars().first()
             if player:
-                await session.refresh(player)
-                log.info(f"Player found in repository: {player.to_dict()}")
+                log.debug("Player found in repository: %s", player.player_id)
         return player
 
     @staticmethod
-    async def player_exists_by_name_in_team(player_name: str, team_id: int) -> bool:
-        async with db.get_db() as session:
+    @profiled("PlayerRepository.player_exists_by_name_in_team")
+    async def player_exists_by_name_in_team(
+        uow: UnitOfWork, player_name: str, team_id: int
+    ) -> bool:
+        async with uow.session(readonly=True) as session:
             stmt = sql_select(Player).where(
                 Player.player_name == player_name, Player.team_id == team_id
             )
@@ -40,9 +78,58 @@ class PlayerRepository:
             return player is not None
 
     @staticmethod
-    async def get_players(team_id: int) -> list[Player]:
-        async with db.get_db() as session:
+    @profiled("PlayerRepository.get_existing_names_in_team")
+    async def get_existing_names_in_team(
+        uow: UnitOfWork, player_names: list[str], team_id: int
+    ) -> set[str]:
+        async with uow.session(readonly=True) as session:
+            stmt = sql_select(Player.player_name).where(
+                Player.team_id == team_id,
+                Player.player_name
+                == any_(bindparam("player_names", player_names, type_=ARRAY(String))),
+            )
+            result = await session.execute(stmt)
+            return set(result.scalars().all())
+
+    @staticmethod
+    @profiled("PlayerRepository.get_players")
+    async def get_players(
+        uow: UnitOfWork, team_id: int, limit: int, after_id: Optional[int] = None
+    ) -> list[Player]:
+        async with uow.session(readonly=True) as session:
             stmt = sql_select(Player).where(Player.team_id == team_id)
+            if after_id is not None:
+                stmt = stmt.where(Player.player_id > after_id)
+            stmt = stmt.order_by(Player.player_id).limit(limit)
+            result = await session.execute(stmt)
+            players = result.scalars().all()
+            return list(players)
+
+    @staticmethod
+    @profiled("PlayerRepository.get_players_by_team_ids")
+    async def get_players_by_team_ids(
+        uow: UnitOfWork, team_ids: list[int], limit_per_team: int
+    ) -> list[Player]:
+        async with uow.session(readonly=True) as session:
+            ranked = (
+                sql_select(
+                    Player.player_id,
+                    func.row_number()
+                    .over(partition_by=Player.team_id, order_by=Player.player_id)
+                    .label("position"),
+                )
+                .where(
+                    Player.team_id
+                    == any_(bindparam("team_ids", team_ids, type_=ARRAY(Integer)))
+                )
+                .subquery()
+            )
+            stmt = (
+                sql_select(Player)
+                .join(ranked, ranked.c.player_id == Player.player_id)
+                .where(ranked.c.position <= limit_per_team)
+                .order_by(Player.player_id)
+            )
             result = await session.execute(stmt)
             players = result.scalars().all()
             return list(players)
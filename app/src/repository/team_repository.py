@@ -1,48 +1,141 @@
 from typing import Optional
+from sqlalchemy import (
+    ARRAY,
+    String,
+    any_,
+    bindparam,
+    insert as sql_insert,
+    update as sql_update,
+)
 from sqlalchemy.future import select as sql_select
 from models.team_model import Team
-from data.session import db
+from data.unit_of_work import UnitOfWork
+from repository.base import TeamRepositoryInterface
+from utils.cache import TTLCache
 from utils.logger import logger_config
+from utils.profiling import profiled
+from utils.config import get_settings
 
 log = logger_config(__name__)
+settings = get_settings()
 
+team_cache: TTLCache[dict] = TTLCache(
+    maxsize=settings.TEAM_CACHE_MAX_SIZE, ttl=settings.TEAM_CACHE_TTL, name="team"
+)
 
-class TeamRepository:
+
+def _cache_entry(team: Team) -> dict:
+    return {
+        "team_id": team.team_id,
+        "team_name": team.team_name,
+        "team_password": team.team_password,
+        "created_at": team.created_at,
+    }
+
+
+class TeamRepository(TeamRepositoryInterface):
     @staticmethod
-    async def create(team_data: Team) -> Team:
-        async with db.get_db() as session:
-            async with db.commit_rollback(session):
-                session.add(team_data)
-                await session.flush()
-                await session.refresh(team_data)
-                log.info(f"Team created in repository: {team_data.to_dict()}")
+    @profiled("TeamRepository.create")
+    async def create(uow: UnitOfWork, team_data: Team) -> Team:
+        async with uow.session() as session:
+            session.add(team_data)
+            await session.flush()
+            log.info("Team created in repository: %s", team_data.team_id)
+        team_cache.invalidate(team_data.team_name)
         return team_data
 
     @staticmethod
-    async def get_by_name(team_name: str) -> Optional[Team]:
-        async with db.get_db() as session:
+    @profiled("TeamRepository.create_many")
+    async def create_many(uow: UnitOfWork, teams: list[dict]) -> list[Team]:
+        async with uow.session() as session:
+            stmt = sql_insert(Team).values(teams).returning(Team)
+            result = await session.execute(stmt)
+            created = list(result.scalars().all())
+            log.info("%s teams created in repository", len(created))
+        for team in created:
+            team_cache.invalidate(team.team_name)
+        return created
+
+    @staticmethod
+    @profiled("TeamRepository.update_password")
+    async def update_password(
+        uow: UnitOfWork, team_id: int, team_name: str, password_hash: str
+    ) -> None:
+        async with uow.session() as session:
+            stmt = (
+                sql_update(Team)
+                .where(Team.team_id == team_id)
+                .values(team_password=password_hash)
+            )
+            await session.execute(stmt)
+            log.info("Team password updated in repository for team %s", team_id)
+        team_cache.invalidate(team_name)
+
+    @staticmethod
+    @profiled("TeamRepository.get_by_name")
+    async def get_by_name(uow: UnitOfWork, team_name: str) -> Optional[Team]:
+        cached = team_cache.get(team_name)
+        if cached is not None:
+            log.debug("Team cache hit for %s", team_name)
+            return Team(**cached)
+        async with uow.session(readonly=True) as session:
             stmt = sql_select(Team).where(Team.team_name == team_name)
             result = await session.execute(stmt)
             team = result.scalars().first()
             if team:
-                await session.refresh(team)
-                log.info(f"Team found in repository: {team.to_dict()}")
+                team_cache.set(team_name, _cache_entry(team))
+                log.debug("Team found in repository: %s", team.team_id)
         return team
 
     @staticmethod
-    async def get_by_id(team_id: int) -> Optional[Team]:
-        async with db.get_db() as session:
+    @profiled("TeamRepository.get_by_names")
+    async def get_by_names(uow: UnitOfWork, team_names: list[str]) -> list[Team]:
+        teams = []
+        missing = []
+        for team_name in team_names:
+            cached = team_cache.get(team_name)
+            if cached is not None:
+                teams.append(Team(**cached))
+            else:
+                missing.append(team_name)
+        if missing:
+            async with uow.session(readonly=True) as session:
+                stmt = sql_select(Team).where(
+                    Team.team_name
+                    == any_(bindparam("team_names", missing, type_=ARRAY(String)))
+                )
+                result = await session.execute(stmt)
+                for team in result.scalars().all():
+                    team_cache.set(team.team_name, _cache_entry(team))
+                    teams.append(team)
+        log.info("Found %s of %s teams in repository", len(teams), len(team_names))
+        return teams
+
+    @staticmethod
+    @profiled("TeamRepository.get_roster_version")
+    async def get_roster_version(uow: UnitOfWork, team_name: str) -> Optional[int]:
+        async with uow.session(readonly=True) as session:
+            stmt = sql_select(Team.roster_version).where(Team.team_name == team_name)
+            result = await session.execute(stmt)
+            return result.scalar()
+
+    @staticmethod
+    @profiled("TeamRepository.get_by_id")
+    async def get_by_id(uow: UnitOfWork, team_id: int) -> Optional[Team]:
+        async with uow.session(readonly=True) as session:
             stmt = sql_select(Team).where(Team.team_id == team_id)
             result = await session.execute(stmt)
             team = result.scalars().first()
             if team:
-                await session.refresh(team)
-                log.info(f"Team found in repository: {team.to_dict()}")
+                log.debug("Team found in repository: %s", team.team_id)
         return team
 
     @staticmethod
-    async def team_exists_by_name(team_name: str) -> bool:
-        async with db.get_db() as session:
+    @profiled("TeamRepository.team_exists_by_name")
+    async def team_exists_by_name(uow: UnitOfWork, team_name: str) -> bool:
+        if team_cache.get(team_name) is not None:
+            return True
+        async with uow.session(readonly=True) as session:
             stmt = sql_select(Team).where(Team.team_name == team_name)
             result = await session.execute(stmt)
             team = result.scalars().first()
@@ -0,0 +1,194 @@
+import inspect
+import time
+from typing import Any, Dict, Iterator, Optional
+
+import orjson
+from graphql import ExecutionResult as GraphQLExecutionResult, GraphQLError
+from strawberry.extensions import SchemaExtension
+
+from utils.concurrency import concurrency_limiter
+from utils.config import get_settings
+from utils.logger import logger_config
+from utils.metrics import (
+    GRAPHQL_OPERATION_ERRORS,
+    GRAPHQL_OPERATION_LATENCY,
+    GRAPHQL_OPERATIONS_IN_FLIGHT,
+)
+from utils.profiling import Profile, current_profile, span
+
+log = logger_config(__name__)
+settings = get_settings()
+
+PROFILE_HEADER = "x-profile"
+PROFILE_HEADER_VALUES = {"1", "true", "yes"}
+
+
+class MetricsExtension(SchemaExtension):
+    """
+    Records latency, errors and in-flight count of every GraphQL operation.
+    The in-flight count is also kept in the process for the shutdown drain.
+    Subscriptions last as long as their connection and are not recorded.
+    usage: Schema(query=Query, extensions=[MetricsExtension])
+    """
+
+    in_flight: int = 0
+
+    def on_operation(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            labels = self._labels()
+            if labels[0] != "subscription":
+                self._observe(labels, time.perf_counter() - start)
+
+    def on_execute(self) -> Iterator[None]:
+        if self.execution_context.operation_type.value == "subscription":
+            yield
+            return
+        GRAPHQL_OPERATIONS_IN_FLIGHT.inc()
+        MetricsExtension.in_flight += 1
+        try:
+            yield
+        finally:
+            MetricsExtension.in_flight -= 1
+            GRAPHQL_OPERATIONS_IN_FLIGHT.dec()
+
+    def _observe(self, labels, elapsed: float):
+        GRAPHQL_OPERATION_LATENCY.labels(*labels).observe(elapsed)
+        context = self.execution_context
+        if context.pre_execution_errors or (
+            context.result is not None and context.result.errors
+        ):
+            GRAPHQL_OPERATION_ERRORS.labels(*labels).inc()
+
+    def _labels(self):
+        context = self.execution_context
+        try:
+            operation_type = context.operation_type.value
+        except RuntimeError:
+            # The document could not be parsed.
+            operation_type = "unknown"
+        return operation_type, context.operation_name or "anonymous"
+
+
+class ConcurrencyLimitExtension(SchemaExtension):
+    """
+    Admits operations through the adaptive concurrency limiter. Rejected
+    operations are not executed and fail fast with a retryable OVERLOADED
+    error and a 503 status, instead of queueing for a database connection.
+    Subscriptions are long-lived and are not limited.
+    usage: Schema(query=Query, extensions=[ConcurrencyLimitExtension])
+    """
+
+    def on_execute(self) -> Iterator[None]:
+        context = self.execution_context
+        operation_type = context.operation_type.value
+        if not settings.CONCURRENCY_LIMIT_ENABLED or operation_type == "subscription":
+            yield
+            return
+        if not concurrency_limiter.try_acquire(operation_type):
+            context.result = GraphQLExecutionResult(
+                data=None,
+                errors=[
+                    GraphQLError(
+                        "Service is overloaded, retry later",
+                        extensions={
+                            "code": "OVERLOADED",
+                            "retryable": True,
+                            "retry_after": settings.CONCURRENCY_RETRY_AFTER,
+                        },
+                    )
+                ],
+            )
+            response = (
+                context.context.get("response")
+                if isinstance(context.context, dict)
+                else None
+            )
+            if response is not None:
+                response.status_code = 503
+                response.headers["Retry-After"] = str(settings.CONCURRENCY_RETRY_AFTER)
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            concurrency_limiter.release(time.perf_counter() - start)
+
+
+class ProfilingExtension(SchemaExtension):
+    """
+    Captures a span breakdown (resolver, service, repository, database and
+    publish calls) of the operation. It is returned under
+    extensions.profile when PROFILING_ENABLED is set or, with
+    PROFILING_HEADER_ENABLED, the request carries X-Profile: 1 and either
+    DEBUG is set or the client is in PROFILING_ALLOWED_HOSTS. It is logged
+    when the operation is slower than PROFILING_SLOW_THRESHOLD_MS. Subscriptions are not profiled.
+    usage: curl -H "X-Profile: 1" -d '{"query": "..."}' /v1/graphql
+    """
+
+    def on_operation(self) -> Iterator[None]:
+        self.profile: Optional[Profile] = None
+        self.expose = False
+        yield
+
+    def on_execute(self) -> Iterator[None]:
+        if self.execution_context.operation_type.value == "subscription":
+            yield
+            return
+        self.expose = settings.PROFILING_ENABLED or self._requested()
+        if not self.expose and settings.PROFILING_SLOW_THRESHOLD_MS <= 0:
+            yield
+            return
+        self.profile = Profile()
+        token = current_profile.set(self.profile)
+        try:
+            yield
+        finally:
+            current_profile.reset(token)
+            elapsed_ms = self.profile.elapsed_ms()
+            if 0 < settings.PROFILING_SLOW_THRESHOLD_MS <= elapsed_ms:
+                log.warning(
+                    "Slow operation %s took %.1fms: %s",
+                    self.execution_context.operation_name or "anonymous",
+                    elapsed_ms,
+                    orjson.dumps(self.profile.to_dict()).decode(),
+                )
+
+    def resolve(self, _next, root, info, *args, **kwargs) -> Any:
+        result = _next(root, info, *args, **kwargs)
+        # Only root fields get a span; nested fields are plain attribute reads.
+        if (
+            current_profile.get() is None
+            or info.path.prev is not None
+            or not inspect.isawaitable(result)
+        ):
+            return result
+
+        async def timed():
+            with span(f"resolver.{info.field_name}"):
+                return await result
+
+        return timed()
+
+    def get_results(self) -> Dict[str, Any]:
+        if self.expose and self.profile is not None:
+            return {"profile": self.profile.to_dict()}
+        return {}
+
+    def _requested(self) -> bool:
+        if not settings.PROFILING_HEADER_ENABLED:
+            return False
+        context = self.execution_context.context
+        request = context.get("request") if isinstance(context, dict) else None
+        if request is None:
+            return False
+        value = request.headers.get(PROFILE_HEADER, "").strip().lower()
+        if value not in PROFILE_HEADER_VALUES:
+            return False
+        if settings.DEBUG:
+            return True
+        allowed = {h.strip() for h in settings.PROFILING_ALLOWED_HOSTS.split(",")}
+        return request.client is not None and request.client.host in allowed
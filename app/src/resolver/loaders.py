@@ -0,0 +1,23 @@
+from typing import Any, Dict, List, Optional
+
+from strawberry.dataloader import DataLoader
+
+from data.unit_of_work import UnitOfWork
+
+from resolver.team_schema import TeamDataType
+from resolver.player_schema import PlayerDataOutput
+
+from service.team_service import TeamService
+
+
+def create_loaders(uow: UnitOfWork, team_service: TeamService) -> Dict[str, Any]:
+    async def load_teams(team_names: List[str]) -> List[Optional[TeamDataType]]:
+        return await team_service.get_teams_by_names(uow, list(team_names))
+
+    async def load_players(team_ids: List[int]) -> List[List[PlayerDataOutput]]:
+        return await team_service.get_players_by_team_ids(uow, list(team_ids))
+
+    return {
+        "team_loader": DataLoader(load_fn=load_teams),
+        "players_loader": DataLoader(load_fn=load_players),
+    }
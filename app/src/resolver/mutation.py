@@ -1,14 +1,17 @@
 import strawberry
 from strawberry.types import Info
-from typing import Annotated, Optional
+from typing import Annotated, List, Optional
 
 from resolver.team_schema import (
     TeamDataInput,
     TeamDataType,
+    TeamsCreatedType,
+)
+from resolver.player_schema import (
+    PlayerDataInput,
+    PlayerDataType,
+    PlayersCreatedType,
 )
-from resolver.player_schema import PlayerDataInput, PlayerDataType
-
-from service.team_service import TeamService
 
 from utils.logger import logger_config
 
@@ -23,9 +26,10 @@ class Mutation:
         info: Info,
         new_team: Annotated[TeamDataInput, strawberry.argument(name="new_team")],
     ) -> Optional[TeamDataType]:
-        publisher = info.context["publisher"]
-        log.info(f"Creating team with data: {new_team}")
-        return await TeamService.create_team(new_team, publisher)
+        uow = info.context["uow"]
+        team_service = info.context["team_service"]
+        log.info("Creating team %s", new_team.team_name)
+        return await team_service.create_team(uow, new_team)
 
     @strawberry.mutation(name="create_player")
     async def create_player(
@@ -33,9 +37,35 @@ class Mutation:
         info: Info,
         new_player: Annotated[PlayerDataInput, strawberry.argument(name="new_player")],
     ) -> Optional[PlayerDataType]:
-        publisher = info.context["publisher"]
-        log.info(f"Creating player with data: {new_player}")
-        return await TeamService.create_player(new_player, publisher)
+        uow = info.context["uow"]
+        team_service = info.context["team_service"]
+        log.info("Creating player with data: %s", new_player)
+        return await team_service.create_player(uow, new_player)
+
+    @strawberry.mutation(name="create_teams")
+    async def create_teams(
+        self,
+        info: Info,
+        new_teams: Annotated[
+            List[TeamDataInput], strawberry.argument(name="new_teams")
+        ],
+    ) -> TeamsCreatedType:
+        uow = info.context["uow"]
+        team_service = info.context["team_service"]
+        log.info("Creating %s teams", len(new_teams))
+        return await team_service.create_teams(uow, new_teams)
+
+    @strawberry.mutation(name="create_players")
+    async def create_players(
+        self,
+        info: Info,
+        team_name: Annotated[str, strawberry.argument(name="team_name")],
+        player_names: Annotated[List[str], strawberry.argument(name="player_names")],
+    ) -> PlayersCreatedType:
+        uow = info.context["uow"]
+        team_service = info.context["team_service"]
+        log.info("Creating %s players in team %s", len(player_names), team_name)
+        return await team_service.create_players(uow, team_name, player_names)
 
     @strawberry.mutation(name="join_team")
     async def join_team(
@@ -44,5 +74,7 @@ class Mutation:
         team_data: Annotated[TeamDataInput, strawberry.argument(name="team_data")],
     ) -> Optional[TeamDataType]:
         publisher = info.context["publisher"]
-        log.info(f"Joining team with data: {team_data}")
-        return await TeamService.join_team(team_data, publisher)
+        uow = info.context["uow"]
+        team_service = info.context["team_service"]
+        log.info("Joining team %s", team_data.team_name)
+        return await team_service.join_team(uow, team_data, publisher)
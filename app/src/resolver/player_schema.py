@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 import strawberry
 
 
@@ -21,8 +21,31 @@ class PlayerDataOutput:
     player_name: str = strawberry.field(name="player_name")
 
 
+@strawberry.type
+class PageInfo:
+    has_next_page: bool = strawberry.field(name="has_next_page")
+    start_cursor: Optional[str] = strawberry.field(name="start_cursor")
+    end_cursor: Optional[str] = strawberry.field(name="end_cursor")
+
+
 @strawberry.type
 class PlayerDataListType:
     team_id: int = strawberry.field(name="team_id")
     team_name: str = strawberry.field(name="team_name")
     players_data: List[PlayerDataOutput] = strawberry.field(name="players_data")
+    page_info: Optional[PageInfo] = strawberry.field(name="page_info", default=None)
+
+
+@strawberry.type
+class BulkItemError:
+    index: int = strawberry.field(name="index")
+    name: str = strawberry.field(name="name")
+    message: str = strawberry.field(name="message")
+
+
+@strawberry.type
+class PlayersCreatedType:
+    team_id: int = strawberry.field(name="team_id")
+    team_name: str = strawberry.field(name="team_name")
+    players_data: List[PlayerDataType] = strawberry.field(name="players_data")
+    errors: List[BulkItemError] = strawberry.field(name="errors")
@@ -1,7 +1,7 @@
-from typing import Annotated, Optional
+from typing import Annotated, List, Optional
+import orjson
 import strawberry
-
-from service.team_service import TeamService
+from strawberry.types import Info
 
 from resolver.player_schema import PlayerDataListType
 
@@ -10,12 +10,64 @@ from utils.logger import logger_config
 log = logger_config(__name__)
 
 
+def _if_none_match(info: Info, etag: str) -> bool:
+    header = info.context["request"].headers.get("if-none-match")
+    if not header:
+        return False
+    return any(tag.strip() in (etag, "*") for tag in header.split(","))
+
+
+def _selection_key(info: Info) -> str:
+    # Selected fields are parsed, so whitespace and formatting of the query do
+    # not change the key.
+    variables = orjson.dumps(info.variable_values, option=orjson.OPT_SORT_KEYS)
+    return repr(info.selected_fields) + variables.decode()
+
+
 @strawberry.type
 class Query:
     @strawberry.field(name="get_players")
     async def get_players(
         self,
+        info: Info,
         team_name: Annotated[str, strawberry.argument(name="team_name")],
+        first: Annotated[Optional[int], strawberry.argument(name="first")] = None,
+        after: Annotated[Optional[str], strawberry.argument(name="after")] = None,
     ) -> Optional[PlayerDataListType]:
-        log.info(f"Getting players for team {team_name}")
-        return await TeamService.get_players(team_name)
+        log.info("Getting players for team %s", team_name)
+        uow = info.context["uow"]
+        team_service = info.context["team_service"]
+        response = info.context.get("response")
+        # The ETag describes the whole response body, so it is only used when
+        # get_players is the operation's single field.
+        if response is not None and len(info.operation.selection_set.selections) == 1:
+            etag = await team_service.get_roster_etag(
+                uow, team_name, first, after, _selection_key(info)
+            )
+            if etag is not None:
+                response.headers["ETag"] = etag
+                if _if_none_match(info, etag):
+                    response.status_code = 304
+                    return None
+        return await team_service.get_players(uow, team_name, first, after)
+
+    @strawberry.field(name="get_rosters")
+    async def get_rosters(
+        self,
+        info: Info,
+        team_names: Annotated[List[str], strawberry.argument(name="team_names")],
+    ) -> List[PlayerDataListType]:
+        log.info("Getting rosters for teams %s", team_names)
+        teams = await info.context["team_loader"].load_many(team_names)
+        teams = [team for team in teams if team is not None]
+        players = await info.context["players_loader"].load_many(
+            [team.team_id for team in teams]
+        )
+        return [
+            PlayerDataListType(
+                team_id=team.team_id,
+                team_name=team.team_name,
+                players_data=team_players,
+            )
+            for team, team_players in zip(teams, players)
+        ]
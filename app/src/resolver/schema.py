@@ -1,7 +1,31 @@
 from strawberry import Schema
+from strawberry.extensions import ParserCache, ValidationCache
 
 from resolver.query import Query
 from resolver.mutation import Mutation
+from resolver.subscription import Subscription
+from resolver.extensions import (
+    ConcurrencyLimitExtension,
+    MetricsExtension,
+    ProfilingExtension,
+)
 
+from utils.config import get_settings
 
-schema = Schema(query=Query, mutation=Mutation)
+settings = get_settings()
+
+
+schema = Schema(
+    query=Query,
+    mutation=Mutation,
+    subscription=Subscription,
+    extensions=[
+        MetricsExtension,
+        ProfilingExtension,
+        ConcurrencyLimitExtension,
+        # Clients send the same few operations, so parsed and validated
+        # documents are reused instead of being rebuilt on every request.
+        lambda: ParserCache(maxsize=settings.GRAPHQL_DOCUMENT_CACHE_SIZE),
+        lambda: ValidationCache(maxsize=settings.GRAPHQL_DOCUMENT_CACHE_SIZE),
+    ],
+)
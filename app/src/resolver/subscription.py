@@ -0,0 +1,46 @@
+from typing import Annotated, AsyncGenerator, List, Optional
+import strawberry
+from strawberry.types import Info
+
+from events.event_bus import event_bus
+
+from resolver.team_schema import TeamEventType
+
+from utils.logger import logger_config
+
+log = logger_config(__name__)
+
+EVENT_TYPES = {"team_created", "player_created", "team_joined"}
+
+
+@strawberry.type
+class Subscription:
+    @strawberry.subscription(name="team_events")
+    async def team_events(
+        self,
+        info: Info,
+        team_name: Annotated[
+            Optional[str], strawberry.argument(name="team_name")
+        ] = None,
+        event_types: Annotated[
+            Optional[List[str]], strawberry.argument(name="event_types")
+        ] = None,
+    ) -> AsyncGenerator[TeamEventType, None]:
+        unknown = set(event_types or ()) - EVENT_TYPES
+        if unknown:
+            raise ValueError(f"Unknown event types {sorted(unknown)}")
+        team_id = None
+        if team_name is not None:
+            team = await info.context["team_loader"].load(team_name)
+            if team is None:
+                raise ValueError(f"Team with name {team_name} does not exist")
+            team_id = team.team_id
+            # The socket stays open for the subscription's lifetime, so the
+            # connection used for the lookup is handed back to the pool now.
+            await info.context["uow"].close()
+        log.info("Subscribing to events of team %s", team_name or "*")
+        async with event_bus.subscribe(
+            team_id, set(event_types) if event_types else None
+        ) as events:
+            async for event in events:
+                yield TeamEventType.from_event(event)
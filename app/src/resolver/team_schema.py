@@ -1,4 +1,8 @@
+from typing import Any, Dict, List, Optional
 import strawberry
+from strawberry.types import Info
+
+from resolver.player_schema import BulkItemError, PlayerDataOutput
 
 
 @strawberry.type
@@ -6,8 +10,38 @@ class TeamDataType:
     team_id: int = strawberry.field(name="team_id")
     team_name: str = strawberry.field(name="team_name")
 
+    @strawberry.field(name="players")
+    async def players(self, info: Info) -> List[PlayerDataOutput]:
+        return await info.context["players_loader"].load(self.team_id)
+
 
 @strawberry.input
 class TeamDataInput:
     team_name: str = strawberry.field(name="team_name")
     team_password: str = strawberry.field(name="team_password")
+
+
+@strawberry.type
+class TeamsCreatedType:
+    teams_data: List[TeamDataType] = strawberry.field(name="teams_data")
+    errors: List[BulkItemError] = strawberry.field(name="errors")
+
+
+@strawberry.type
+class TeamEventType:
+    event_type: str = strawberry.field(name="event_type")
+    team_id: int = strawberry.field(name="team_id")
+    team_name: Optional[str] = strawberry.field(name="team_name")
+    player_id: Optional[int] = strawberry.field(name="player_id")
+    player_name: Optional[str] = strawberry.field(name="player_name")
+
+    @classmethod
+    def from_event(cls, event: Dict[str, Any]) -> "TeamEventType":
+        data = event["data"]
+        return cls(
+            event_type=event["event_type"],
+            team_id=data["team_id"],
+            team_name=data.get("team_name"),
+            player_id=data.get("player_id"),
+            player_name=data.get("player_name"),
+        )
@@ -1,11 +1,89 @@
-from fastapi import APIRouter
+import hashlib
+from typing import Optional
+
+from fastapi import APIRouter, Response, status
+from graphql import GraphQLError
 from strawberry.fastapi import GraphQLRouter
+from strawberry.http import GraphQLRequestData
+from strawberry.types import ExecutionResult
 
 from resolver.schema import schema
+from utils.cache import TTLCache
+from utils.config import get_settings
+from utils.metrics import PERSISTED_QUERY_LOOKUPS
+
+settings = get_settings()
+
+persisted_queries: TTLCache[str] = TTLCache(
+    maxsize=settings.APQ_CACHE_SIZE, ttl=settings.APQ_CACHE_TTL
+)
+
+
+def resolve_persisted_query(request_data: GraphQLRequestData) -> Optional[GraphQLError]:
+    """
+    Automatic persisted queries: a request may carry only the sha256 hash of a
+    query sent earlier. On a miss the client resends the hash with the full
+    text, which is then stored.
+    usage: {"extensions": {"persistedQuery": {"version": 1, "sha256Hash": "..."}}}
+    """
+    persisted_query = request_data.extensions["persistedQuery"]
+    if not isinstance(persisted_query, dict) or not isinstance(
+        persisted_query.get("sha256Hash"), str
+    ):
+        return GraphQLError(
+            "Invalid persisted query",
+            extensions={"code": "PERSISTED_QUERY_INVALID"},
+        )
+    if persisted_query.get("version") != 1:
+        return GraphQLError(
+            "Unsupported persisted query version",
+            extensions={"code": "PERSISTED_QUERY_NOT_SUPPORTED"},
+        )
+    sha256_hash = persisted_query["sha256Hash"]
+
+    if request_data.query is None:
+        query = persisted_queries.get(sha256_hash)
+        if query is None:
+            PERSISTED_QUERY_LOOKUPS.labels("miss").inc()
+            return GraphQLError(
+                "PersistedQueryNotFound",
+                extensions={"code": "PERSISTED_QUERY_NOT_FOUND"},
+            )
+        PERSISTED_QUERY_LOOKUPS.labels("hit").inc()
+        request_data.query = query
+        return None
+
+    if hashlib.sha256(request_data.query.encode()).hexdigest() != sha256_hash:
+        return GraphQLError(
+            "provided sha does not match query",
+            extensions={"code": "PERSISTED_QUERY_HASH_MISMATCH"},
+        )
+    PERSISTED_QUERY_LOOKUPS.labels("register").inc()
+    persisted_queries.set(sha256_hash, request_data.query)
+    return None
+
+
+class PersistedQueryGraphQLRouter(GraphQLRouter):
+    async def execute_single(self, *, request_data: GraphQLRequestData, **kwargs):
+        if request_data.extensions and "persistedQuery" in request_data.extensions:
+            error = resolve_persisted_query(request_data)
+            if error is not None:
+                return ExecutionResult(data=None, errors=[error])
+        return await super().execute_single(request_data=request_data, **kwargs)
+
+    def create_response(self, response_data, sub_response: Response) -> Response:
+        if sub_response.status_code == status.HTTP_304_NOT_MODIFIED:
+            # A resolver matched the client's If-None-Match; send no body.
+            response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+            response.headers.raw.extend(sub_response.headers.raw)
+            return response
+        return super().create_response(response_data, sub_response)
 
 
 def graphql_app(get_context):
-    return GraphQLRouter(schema, path="/graphql", context_getter=get_context)
+    return PersistedQueryGraphQLRouter(
+        schema, path="/graphql", context_getter=get_context
+    )
 
 
 graphql_router = APIRouter()
@@ -1,4 +1,20 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, Response
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    generate_latest,
+    multiprocess,
+)
+
+from data.session import db
+from events.event_bus import event_bus
+from repository.team_repository import team_cache
+from utils.concurrency import concurrency_limiter
+from utils.security import verification_cache
 
 health_router = APIRouter()
 
@@ -7,4 +23,79 @@ health_router = APIRouter()
     "/health", tags=["Sanity check"], responses={200: {"description": "Health check"}}
 )
 async def health_check():
-    return {"status": "ok"}
+    # Shedding is reported but stays a 200, so liveness probes do not restart
+    # a replica that is protecting itself from overload.
+    return {
+        "status": "shedding" if concurrency_limiter.shedding else "ok",
+        "concurrency": concurrency_limiter.stats(),
+    }
+
+
+@health_router.get(
+    "/ready",
+    tags=["Sanity check"],
+    responses={
+        200: {"description": "Service is ready to receive traffic"},
+        503: {"description": "Service is starting or shutting down"},
+    },
+)
+async def readiness_check(request: Request):
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse(status_code=503, content={"status": "not ready"})
+    return {
+        "status": "ready",
+        "startup_seconds": request.app.state.startup_seconds,
+    }
+
+
+@health_router.get(
+    "/health/publisher",
+    tags=["Sanity check"],
+    responses={200: {"description": "Event publisher statistics"}},
+)
+async def publisher_stats(request: Request):
+    return request.app.state.publisher_connection.stats()
+
+
+@health_router.get(
+    "/health/subscriptions",
+    tags=["Sanity check"],
+    responses={200: {"description": "GraphQL subscription statistics"}},
+)
+async def subscription_stats():
+    return event_bus.stats()
+
+
+@health_router.get(
+    "/health/database",
+    tags=["Sanity check"],
+    responses={200: {"description": "Database connection pool statistics"}},
+)
+async def database_stats():
+    return db.pool_stats()
+
+
+@health_router.get(
+    "/health/cache",
+    tags=["Sanity check"],
+    responses={200: {"description": "In-process cache statistics"}},
+)
+async def cache_stats():
+    return {
+        "team": team_cache.stats(),
+        "password_verification": verification_cache.stats(),
+    }
+
+
+@health_router.get(
+    "/metrics",
+    tags=["Sanity check"],
+    responses={200: {"description": "Metrics in Prometheus text format"}},
+)
+async def metrics():
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # Several workers: aggregate the metric files every worker writes.
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
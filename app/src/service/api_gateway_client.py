@@ -0,0 +1,132 @@
+import asyncio
+import random
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from utils.logger import logger_config
+from utils.config import get_settings
+
+log = logger_config(__name__)
+settings = get_settings()
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Opens after a number of consecutive failures and fails fast until the
+    reset timeout elapses; then lets a single trial call through (half-open).
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class ApiGatewayClient:
+    """
+    App-scoped HTTP client for the API gateway. Keeps a pool of keep-alive
+    connections and retries transient failures with jittered exponential
+    backoff behind a circuit breaker.
+    usage: client = ApiGatewayClient(); await client.post(payload); await client.close()
+    """
+
+    def __init__(
+        self,
+        url: str = settings.API_GATEWAY_URL,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        retries: int = settings.API_GATEWAY_RETRIES,
+        retry_backoff: float = settings.API_GATEWAY_RETRY_BACKOFF,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.url = url
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.breaker = breaker or CircuitBreaker(
+            settings.API_GATEWAY_BREAKER_THRESHOLD,
+            settings.API_GATEWAY_BREAKER_RESET,
+        )
+        self.client = httpx.AsyncClient(
+            transport=transport,
+            limits=httpx.Limits(
+                max_connections=settings.API_GATEWAY_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.API_GATEWAY_MAX_KEEPALIVE,
+                keepalive_expiry=settings.API_GATEWAY_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(settings.API_GATEWAY_TIMEOUT),
+        )
+
+    async def post(
+        self, payload: Dict[str, Any], timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                raise CircuitOpenError(f"Circuit to {self.url} is open")
+            try:
+                response = await self.client.post(
+                    self.url,
+                    json=payload,
+                    timeout=timeout
+                    if timeout is not None
+                    else httpx.USE_CLIENT_DEFAULT,
+                )
+                if response.status_code >= 500:
+                    response.raise_for_status()
+            except (httpx.RequestError, httpx.HTTPStatusError) as e:
+                self.breaker.record_failure()
+                if attempt >= self.retries:
+                    raise e
+                # Full jitter keeps retries from many workers from synchronizing.
+                delay = random.uniform(0, self.retry_backoff * 2**attempt)
+                log.warning(
+                    "Request to %s failed (%s), retrying in %.2fs", self.url, e, delay
+                )
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancellation must not leave a half-open trial marked in flight.
+                self.breaker.record_failure()
+                raise
+            self.breaker.record_success()
+            response.raise_for_status()
+            return response.json()
+
+    async def close(self):
+        await self.client.aclose()
@@ -1,4 +1,8 @@
-from typing import Any, Dict, Optional
+import asyncio
+import base64
+import binascii
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
 import httpx
 
 from datetime import datetime, timezone
@@ -9,20 +13,42 @@ from models.player_model import Player
 from resolver.team_schema import (
     TeamDataInput,
     TeamDataType,
+    TeamsCreatedType,
 )
 from resolver.player_schema import (
+    BulkItemError,
     PlayerDataInput,
     PlayerDataOutput,
     PlayerDataType,
     PlayerDataListType,
+    PageInfo,
+    PlayersCreatedType,
 )
 
+from repository.base import (
+    OutboxRepositoryInterface,
+    PlayerRepositoryInterface,
+    TeamRepositoryInterface,
+)
 from repository.team_repository import TeamRepository
 from repository.player_repository import PlayerRepository
+from repository.outbox_repository import OutboxRepository
+from repository.memory_repository import (
+    InMemoryOutboxRepository,
+    InMemoryPlayerRepository,
+    InMemoryStore,
+    InMemoryTeamRepository,
+)
 
 from events.publisher import publish_event, Publisher
 
+from data.unit_of_work import UnitOfWork
+
+from service.api_gateway_client import ApiGatewayClient, CircuitOpenError
+
 from utils.logger import logger_config
+from utils.profiling import profiled
+from utils.security import hash_password, is_hashed, verify_password
 from utils.config import get_settings
 
 log = logger_config(__name__)
@@ -30,139 +56,352 @@ settings = get_settings()
 
 
 class TeamService:
-    @staticmethod
-    async def send_to_api_gateway(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Team and player use cases over injected repositories, by default the
+    SQLAlchemy ones.
+    usage: await TeamService().create_team(uow, team_data)
+    """
+
+    def __init__(
+        self,
+        team_repository: Optional[TeamRepositoryInterface] = None,
+        player_repository: Optional[PlayerRepositoryInterface] = None,
+        outbox_repository: Optional[OutboxRepositoryInterface] = None,
+    ):
+        self.team_repository = team_repository or TeamRepository()
+        self.player_repository = player_repository or PlayerRepository()
+        self.outbox_repository = outbox_repository or OutboxRepository()
+
+    @profiled("TeamService.send_to_api_gateway")
+    async def send_to_api_gateway(
+        self,
+        client: ApiGatewayClient,
+        payload: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
         try:
             log.debug(
-                f"Sending request to {settings.API_GATEWAY_URL} with payload: {payload}"
+                "Sending request to %s with payload: %s",
+                settings.API_GATEWAY_URL,
+                payload,
             )
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{settings.API_GATEWAY_URL}", json=payload
-                )
-                response.raise_for_status()
-                log.debug(f"Response received: {response.json()}")
-                return response.json().get("data")
+            response = await client.post(payload, timeout=timeout)
+            log.debug("Response received: %s", response)
+            return response.get("data")
+        except CircuitOpenError as e:
+            log.warning("API gateway unavailable: %s", e)
         except httpx.HTTPStatusError as e:
             log.error(
-                f"Request failed with status {e.response.status_code}: {e.response.text}"
+                "Request failed with status %s: %s",
+                e.response.status_code,
+                e.response.text,
             )
         except httpx.RequestError as e:
-            log.error(f"An error occurred while requesting {e.request.url!r}.")
+            log.error("An error occurred while requesting %r.", e.request.url)
         except Exception as e:
-            log.error(f"Unexpected error: {e}")
+            log.error("Unexpected error: %s", e)
         return None
 
-    @staticmethod
-    async def team_exists_by_name(team_name: str) -> bool:
-        return await TeamRepository.team_exists_by_name(team_name)
+    @profiled("TeamService.team_exists_by_name")
+    async def team_exists_by_name(self, uow: UnitOfWork, team_name: str) -> bool:
+        return await self.team_repository.team_exists_by_name(uow, team_name)
 
-    @staticmethod
-    async def player_exists_by_name_in_team(player_name: str, team_id: int) -> bool:
-        return await PlayerRepository.player_exists_by_name_in_team(
-            player_name, team_id
+    @profiled("TeamService.player_exists_by_name_in_team")
+    async def player_exists_by_name_in_team(
+        self, uow: UnitOfWork, player_name: str, team_id: int
+    ) -> bool:
+        return await self.player_repository.player_exists_by_name_in_team(
+            uow, player_name, team_id
         )
 
-    @staticmethod
-    async def authenticate_team(team_data: TeamDataInput) -> Optional[TeamDataType]:
-        team = await TeamRepository.get_by_name(team_data.team_name)
+    @profiled("TeamService.authenticate_team")
+    async def authenticate_team(
+        self, uow: UnitOfWork, team_data: TeamDataInput
+    ) -> Optional[TeamDataType]:
+        team = await self.team_repository.get_by_name(uow, team_data.team_name)
         if not team:
             raise ValueError("Team does not exist")
-        team_dict = team.to_dict()
-        if team_dict["team_password"] != team_data.team_password:
+        if not await verify_password(team_data.team_password, team.team_password):
             raise ValueError("Invalid password")
+        if not is_hashed(team.team_password):
+            # Migrate legacy plaintext credentials on first successful login.
+            password_hash = await hash_password(team_data.team_password)
+            async with uow.transaction():
+                await self.team_repository.update_password(
+                    uow, team.team_id, team.team_name, password_hash
+                )
+        team_dict = team.to_dict()
         return TeamDataType(
             team_id=team_dict["team_id"],
             team_name=team_dict["team_name"],
         )
 
-    @staticmethod
+    @profiled("TeamService.create_team")
     async def create_team(
-        team_data: TeamDataInput, publisher: Publisher
+        self, uow: UnitOfWork, team_data: TeamDataInput
     ) -> TeamDataType:
-        log.info(f"Creating team: {team_data}")
-
-        if await TeamService.team_exists_by_name(team_data.team_name):
-            raise ValueError(f"Team with name {team_data.team_name} already exists")
-
-        new_team = Team(
-            team_name=team_data.team_name,
-            team_password=team_data.team_password,
-            created_at=datetime.now(timezone.utc),
-        )
+        log.info("Creating team: %s", team_data.team_name)
 
         try:
-            team = (await TeamRepository.create(new_team)).to_dict()
-            team_created = TeamDataType(
-                team_id=team["team_id"],
-                team_name=team["team_name"],
-            )
+            # Hashing is slow on purpose, so it is done before the transaction
+            # checks out a connection.
+            password_hash = await hash_password(team_data.team_password)
+            async with uow.transaction():
+                if await self.team_exists_by_name(uow, team_data.team_name):
+                    raise ValueError(
+                        f"Team with name {team_data.team_name} already exists"
+                    )
 
-            await publish_event(
-                publisher,
-                "team_created",
-                {"team_id": team_created.team_id, "team_name": team_created.team_name},
-            )
+                new_team = Team(
+                    team_name=team_data.team_name,
+                    team_password=password_hash,
+                    created_at=datetime.now(timezone.utc),
+                )
+                team = (await self.team_repository.create(uow, new_team)).to_dict()
+                team_created = TeamDataType(
+                    team_id=team["team_id"],
+                    team_name=team["team_name"],
+                )
+
+                await self.outbox_repository.add(
+                    uow,
+                    "team_created",
+                    {
+                        "team_id": team_created.team_id,
+                        "team_name": team_created.team_name,
+                    },
+                )
             return team_created
         except Exception as e:
-            log.error(f"Error creating team: {e}")
+            log.error("Error creating team: %s", e)
             raise e
 
-    @staticmethod
+    @profiled("TeamService.create_player")
     async def create_player(
-        player_data: PlayerDataInput, publisher: Publisher
+        self, uow: UnitOfWork, player_data: PlayerDataInput
     ) -> Optional[PlayerDataType]:
-        log.info(f"Creating player: {player_data}")
+        log.info("Creating player: %s", player_data)
 
-        team = await TeamRepository.get_by_name(player_data.team_name)
+        try:
+            async with uow.transaction():
+                team = await self.team_repository.get_by_name(
+                    uow, player_data.team_name
+                )
 
-        if not team:
-            raise ValueError(f"Team with name {player_data.team_name} does not exist")
+                if not team:
+                    raise ValueError(
+                        f"Team with name {player_data.team_name} does not exist"
+                    )
 
-        team_dict = team.to_dict()
-        team_id = team_dict["team_id"]
-        if await TeamService.player_exists_by_name_in_team(
-            player_data.player_name, team_id
-        ):
+                team_dict = team.to_dict()
+                team_id = team_dict["team_id"]
+                if await self.player_exists_by_name_in_team(
+                    uow, player_data.player_name, team_id
+                ):
+                    raise ValueError(
+                        f"Player with name {player_data.player_name} already exists in team {player_data.team_name}"
+                    )
+
+                new_player = Player(
+                    player_name=player_data.player_name,
+                    team_id=team_id,
+                    created_at=datetime.now(timezone.utc),
+                )
+                player = (
+                    await self.player_repository.create(uow, new_player)
+                ).to_dict()
+                player_created = PlayerDataType(
+                    player_id=player["player_id"],
+                    team_id=player["team_id"],
+                    player_name=player["player_name"],
+                )
+
+                await self.outbox_repository.add(
+                    uow,
+                    "player_created",
+                    {
+                        "player_id": player_created.player_id,
+                        "player_name": player_created.player_name,
+                        "team_id": player_created.team_id,
+                    },
+                )
+            return player_created
+        except Exception as e:
+            log.error("Error creating player: %s", e)
+            raise e
+
+    @staticmethod
+    def check_bulk_size(count: int):
+        if count > settings.BULK_CREATE_MAX_ITEMS:
             raise ValueError(
-                f"Player with name {player_data.player_name} already exists in team {player_data.team_name}"
+                f"At most {settings.BULK_CREATE_MAX_ITEMS} items can be created at once"
             )
 
-        new_player = Player(
-            player_name=player_data.player_name,
-            team_id=team_id,
-            created_at=datetime.now(timezone.utc),
-        )
+    @profiled("TeamService.create_teams")
+    async def create_teams(
+        self, uow: UnitOfWork, teams_data: List[TeamDataInput]
+    ) -> TeamsCreatedType:
+        log.info("Creating %s teams", len(teams_data))
+        TeamService.check_bulk_size(len(teams_data))
+        errors: List[BulkItemError] = []
+
+        def duplicate(index: int, team_name: str) -> BulkItemError:
+            return BulkItemError(
+                index=index,
+                name=team_name,
+                message=f"Team with name {team_name} already exists",
+            )
 
         try:
-            player = (await PlayerRepository.create(new_player)).to_dict()
-            player_created = PlayerDataType(
-                player_id=player["player_id"],
-                team_id=player["team_id"],
-                player_name=player["player_name"],
+            # First occurrence of each name, with its position in the input.
+            unique: Dict[str, Tuple[int, TeamDataInput]] = {}
+            for index, team_data in enumerate(teams_data):
+                if team_data.team_name in unique:
+                    errors.append(duplicate(index, team_data.team_name))
+                else:
+                    unique[team_data.team_name] = (index, team_data)
+            # Passwords are hashed before the transaction checks out a
+            # connection, so it is not held for the duration of the hashing.
+            password_hashes = dict(
+                zip(
+                    unique,
+                    await asyncio.gather(
+                        *(
+                            hash_password(team_data.team_password)
+                            for _, team_data in unique.values()
+                        )
+                    ),
+                )
             )
 
-            await publish_event(
-                publisher,
-                "player_created",
-                {
-                    "player_id": player_created.player_id,
-                    "player_name": player_created.player_name,
-                    "team_id": player_created.team_id,
-                },
+            async with uow.transaction():
+                existing = {
+                    team.team_name
+                    for team in await self.team_repository.get_by_names(
+                        uow, list(unique)
+                    )
+                }
+                accepted = []
+                for team_name, (index, _) in unique.items():
+                    if team_name in existing:
+                        errors.append(duplicate(index, team_name))
+                    else:
+                        accepted.append(team_name)
+                errors.sort(key=lambda error: error.index)
+
+                created = []
+                if accepted:
+                    created_at = datetime.now(timezone.utc)
+                    teams = await self.team_repository.create_many(
+                        uow,
+                        [
+                            {
+                                "team_name": team_name,
+                                "team_password": password_hashes[team_name],
+                                "created_at": created_at,
+                            }
+                            for team_name in accepted
+                        ],
+                    )
+                    created = [
+                        TeamDataType(team_id=team.team_id, team_name=team.team_name)
+                        for team in teams
+                    ]
+                    await self.outbox_repository.add_many(
+                        uow,
+                        "team_created",
+                        [
+                            {"team_id": team.team_id, "team_name": team.team_name}
+                            for team in created
+                        ],
+                    )
+            return TeamsCreatedType(teams_data=created, errors=errors)
+        except Exception as e:
+            log.error("Error creating teams: %s", e)
+            raise e
+
+    @profiled("TeamService.create_players")
+    async def create_players(
+        self, uow: UnitOfWork, team_name: str, player_names: List[str]
+    ) -> PlayersCreatedType:
+        log.info("Creating %s players in team %s", len(player_names), team_name)
+        TeamService.check_bulk_size(len(player_names))
+        errors: List[BulkItemError] = []
+        try:
+            async with uow.transaction():
+                team = await self.team_repository.get_by_name(uow, team_name)
+                if not team:
+                    raise ValueError(f"Team with name {team_name} does not exist")
+                team_id = team.team_id
+
+                existing = await self.player_repository.get_existing_names_in_team(
+                    uow, list(set(player_names)), team_id
+                )
+                accepted: List[str] = []
+                for index, player_name in enumerate(player_names):
+                    if player_name in existing:
+                        errors.append(
+                            BulkItemError(
+                                index=index,
+                                name=player_name,
+                                message=f"Player with name {player_name} already exists in team {team_name}",
+                            )
+                        )
+                    else:
+                        existing.add(player_name)
+                        accepted.append(player_name)
+
+                created = []
+                if accepted:
+                    created_at = datetime.now(timezone.utc)
+                    players = await self.player_repository.create_many(
+                        uow,
+                        [
+                            {
+                                "player_name": player_name,
+                                "team_id": team_id,
+                                "created_at": created_at,
+                            }
+                            for player_name in accepted
+                        ],
+                    )
+                    created = [
+                        PlayerDataType(
+                            player_id=player.player_id,
+                            team_id=player.team_id,
+                            player_name=player.player_name,
+                        )
+                        for player in players
+                    ]
+                    await self.outbox_repository.add_many(
+                        uow,
+                        "player_created",
+                        [
+                            {
+                                "player_id": player.player_id,
+                                "player_name": player.player_name,
+                                "team_id": player.team_id,
+                            }
+                            for player in created
+                        ],
+                    )
+            return PlayersCreatedType(
+                team_id=team_id,
+                team_name=team_name,
+                players_data=created,
+                errors=errors,
             )
-            return player_created
         except Exception as e:
-            log.error(f"Error creating player: {e}")
+            log.error("Error creating players: %s", e)
             raise e
 
-    @staticmethod
+    @profiled("TeamService.join_team")
     async def join_team(
-        team_data: TeamDataInput, publisher: Publisher
+        self, uow: UnitOfWork, team_data: TeamDataInput, publisher: Publisher
     ) -> Optional[TeamDataType]:
-        log.info(f"Joining team: {team_data}")
+        log.info("Joining team: %s", team_data.team_name)
         try:
-            team = await TeamService.authenticate_team(team_data)
+            team = await self.authenticate_team(uow, team_data)
             if not team:
                 raise ValueError("Invalid team name or password")
             await publish_event(
@@ -173,31 +412,143 @@ class TeamService:
             return team
         except Exception as e:
             log.error(
-                f"Error joining team: {e} - Team does not exist or invalid password"
+                "Error joining team: %s - Team does not exist or invalid password", e
             )
             raise e
 
     @staticmethod
-    async def get_players(team_name: str) -> Optional[PlayerDataListType]:
-        log.info(f"Getting players for team {team_name}")
-        team = await TeamRepository.get_by_name(team_name)
+    def encode_cursor(player_id: int) -> str:
+        return base64.urlsafe_b64encode(f"player:{player_id}".encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> int:
+        try:
+            prefix, player_id = (
+                base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+            )
+            if prefix != "player":
+                raise ValueError(prefix)
+            return int(player_id)
+        except (ValueError, UnicodeDecodeError, binascii.Error):
+            raise ValueError(f"Invalid cursor {cursor}")
+
+    @staticmethod
+    def page_size(first: Optional[int]) -> int:
+        if first is None:
+            return settings.PLAYERS_PAGE_SIZE_DEFAULT
+        if first < 1:
+            raise ValueError("Argument first must be a positive integer")
+        if first > settings.PLAYERS_PAGE_SIZE_MAX:
+            log.warning(
+                "Requested page size %s capped to %s",
+                first,
+                settings.PLAYERS_PAGE_SIZE_MAX,
+            )
+            return settings.PLAYERS_PAGE_SIZE_MAX
+        return first
+
+    @profiled("TeamService.get_roster_etag")
+    async def get_roster_etag(
+        self,
+        uow: UnitOfWork,
+        team_name: str,
+        first: Optional[int] = None,
+        after: Optional[str] = None,
+        selection: str = "",
+    ) -> Optional[str]:
+        roster_version = await self.team_repository.get_roster_version(uow, team_name)
+        if roster_version is None:
+            return None
+        # Each page of the roster, and each selection of fields from it, is a
+        # different representation.
+        tag = hashlib.sha256(
+            f"{team_name}:{roster_version}:{first}:{after}:{selection}".encode()
+        ).hexdigest()[:32]
+        return f'W/"{tag}"'
+
+    @profiled("TeamService.get_players")
+    async def get_players(
+        self,
+        uow: UnitOfWork,
+        team_name: str,
+        first: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> Optional[PlayerDataListType]:
+        log.info("Getting players for team %s", team_name)
+        limit = TeamService.page_size(first)
+        after_id = TeamService.decode_cursor(after) if after else None
+        team = await self.team_repository.get_by_name(uow, team_name)
         if not team:
             raise ValueError(f"Team with name {team_name} does not exist")
-        team_dict = team.to_dict()
-        team_id = team_dict["team_id"]
-        players = await PlayerRepository.get_players(team_id)
-        players_dict = [player.to_dict() for player in players]
-        if players:
-            players_data_output = [
+        team_id = team.team_id
+        # Fetch one extra row to know whether another page follows.
+        players = await self.player_repository.get_players(
+            uow, team_id, limit + 1, after_id
+        )
+        if not players and after_id is None:
+            raise ValueError(f"No players found for team {team_name}")
+        has_next_page = len(players) > limit
+        players_data_output = [
+            PlayerDataOutput(
+                player_id=player.player_id,
+                player_name=player.player_name,
+            )
+            for player in players[:limit]
+        ]
+        return PlayerDataListType(
+            team_id=team_id,
+            team_name=team_name,
+            players_data=players_data_output,
+            page_info=PageInfo(
+                has_next_page=has_next_page,
+                start_cursor=TeamService.encode_cursor(players_data_output[0].player_id)
+                if players_data_output
+                else None,
+                end_cursor=TeamService.encode_cursor(players_data_output[-1].player_id)
+                if players_data_output
+                else None,
+            ),
+        )
+
+    @profiled("TeamService.get_teams_by_names")
+    async def get_teams_by_names(
+        self, uow: UnitOfWork, team_names: List[str]
+    ) -> List[Optional[TeamDataType]]:
+        teams = await self.team_repository.get_by_names(uow, team_names)
+        teams_by_name = {
+            team.team_name: TeamDataType(team_id=team.team_id, team_name=team.team_name)
+            for team in teams
+        }
+        return [teams_by_name.get(team_name) for team_name in team_names]
+
+    @profiled("TeamService.get_players_by_team_ids")
+    async def get_players_by_team_ids(
+        self, uow: UnitOfWork, team_ids: List[int]
+    ) -> List[List[PlayerDataOutput]]:
+        players = await self.player_repository.get_players_by_team_ids(
+            uow, team_ids, settings.PLAYERS_PAGE_SIZE_MAX
+        )
+        players_by_team: Dict[int, List[PlayerDataOutput]] = {
+            team_id: [] for team_id in team_ids
+        }
+        for player in players:
+            players_by_team[player.team_id].append(
                 PlayerDataOutput(
-                    player_id=player["player_id"],
-                    player_name=player["player_name"],
+                    player_id=player.player_id,
+                    player_name=player.player_name,
                 )
-                for player in players_dict
-            ]
-            return PlayerDataListType(
-                team_id=team_id,
-                team_name=team_name,
-                players_data=players_data_output,
             )
-        raise ValueError(f"No players found for team {team_name}")
+        return [players_by_team[team_id] for team_id in team_ids]
+
+
+def create_team_service(backend: str = settings.REPOSITORY_BACKEND) -> TeamService:
+    if backend == "sql":
+        return TeamService()
+    if backend == "memory":
+        store = InMemoryStore()
+        return TeamService(
+            InMemoryTeamRepository(store),
+            InMemoryPlayerRepository(store),
+            InMemoryOutboxRepository(store),
+        )
+    raise ValueError(f"Unknown repository backend {backend}")
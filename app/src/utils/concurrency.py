@@ -0,0 +1,92 @@
+import time
+from typing import Any, Dict, Optional
+
+from utils.config import get_settings
+from utils.metrics import CONCURRENCY_LIMIT, OPERATIONS_SHED
+
+settings = get_settings()
+
+# The service reports it is shedding load for this long after a rejection.
+SHEDDING_WINDOW = 10.0
+
+
+def _parse_shares(config: str) -> Dict[str, float]:
+    shares = {}
+    for item in config.split(","):
+        if "=" in item:
+            operation_type, share = item.split("=", 1)
+            shares[operation_type.strip()] = float(share)
+    return shares
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limit on concurrently executing operations. The limit grows by about
+    one per limit's worth of operations that finish under the latency target
+    while it is being used, and is cut by the backoff ratio, at most once per
+    target interval, when they finish over it.
+    Each operation type may only fill its share of the limit, so with
+    query=1.0,mutation=0.8 the last fifth is kept free for queries.
+    usage: if limiter.try_acquire("query"): ...; limiter.release(latency)
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = settings.CONCURRENCY_LIMIT_INITIAL,
+        min_limit: int = settings.CONCURRENCY_LIMIT_MIN,
+        max_limit: int = settings.CONCURRENCY_LIMIT_MAX,
+        latency_target: float = settings.CONCURRENCY_LATENCY_TARGET_MS / 1000,
+        backoff_ratio: float = settings.CONCURRENCY_BACKOFF_RATIO,
+        priority_shares: str = settings.CONCURRENCY_PRIORITY_SHARES,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff_ratio = backoff_ratio
+        self.shares = _parse_shares(priority_shares)
+        self.in_flight = 0
+        self.rejected = 0
+        self._last_decrease = 0.0
+        self._last_rejected: Optional[float] = None
+        CONCURRENCY_LIMIT.set(self.limit)
+
+    def try_acquire(self, operation_type: str) -> bool:
+        if self.in_flight >= self.limit * self.shares.get(operation_type, 1.0):
+            self.rejected += 1
+            self._last_rejected = time.monotonic()
+            OPERATIONS_SHED.labels(operation_type).inc()
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latency: float):
+        in_flight = self.in_flight
+        self.in_flight -= 1
+        now = time.monotonic()
+        if latency > self.latency_target:
+            if now - self._last_decrease >= self.latency_target:
+                self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+                self._last_decrease = now
+        elif in_flight >= self.limit / 2:
+            # Only grow while the limit is actually the constraint.
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        CONCURRENCY_LIMIT.set(self.limit)
+
+    @property
+    def shedding(self) -> bool:
+        return (
+            self._last_rejected is not None
+            and time.monotonic() - self._last_rejected < SHEDDING_WINDOW
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "shedding": self.shedding,
+            "limit": round(self.limit, 1),
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+        }
+
+
+concurrency_limiter = AdaptiveConcurrencyLimiter()
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 
 from dotenv import load_dotenv
 
@@ -11,12 +12,22 @@ class Settings(BaseSettings):
     DEBUG: bool
     DEBUG_PORT: str
     LOG_LEVEL: str
+    LOG_QUEUE_ENABLED: bool
+    LOG_JSON: bool
+    LOG_SAMPLING: str
+    PROFILING_ENABLED: bool
+    PROFILING_HEADER_ENABLED: bool
+    PROFILING_ALLOWED_HOSTS: str
+    PROFILING_SLOW_THRESHOLD_MS: float
     DOCKERHUB_USERNAME: str
     IMAGE_NAME: str
     IMAGE_VERSION: str
     APP_MODULE: str
-    APP_PORT: str
+    APP_PORT: int
     APP_HOST: str
+    APP_WORKERS: int
+    APP_WORKERS_MAX: int
+    SHUTDOWN_DRAIN_TIMEOUT: float
     APP_DESCRIPTION: str
     API_PREFIX: str
     DOC_URL: str
@@ -27,8 +38,30 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASSWORD: str
     DB_NAME: str
+    DB_REPLICA_HOSTS: str
+    REPOSITORY_BACKEND: str
+    SEED_SAMPLE_DATA: bool
+    PASSWORD_SCRYPT_N: int
+    PASSWORD_HASH_WORKERS: int
+    PASSWORD_VERIFY_CACHE_SIZE: int
+    PASSWORD_VERIFY_CACHE_TTL: int
+    DB_ECHO: bool
+    DB_POOL_SIZE: int
+    DB_MAX_OVERFLOW: int
+    DB_POOL_TIMEOUT: float
+    DB_POOL_RECYCLE: int
+    DB_POOL_PRE_PING: bool
+    DB_STATEMENT_CACHE_SIZE: int
     API_GATEWAY_HOST: str
     API_GATEWAY_PORT: str
+    API_GATEWAY_MAX_CONNECTIONS: int
+    API_GATEWAY_MAX_KEEPALIVE: int
+    API_GATEWAY_KEEPALIVE_EXPIRY: float
+    API_GATEWAY_TIMEOUT: float
+    API_GATEWAY_RETRIES: int
+    API_GATEWAY_RETRY_BACKOFF: float
+    API_GATEWAY_BREAKER_THRESHOLD: int
+    API_GATEWAY_BREAKER_RESET: float
     BROKER_HOST: str
     BROKER_PORT: int
     BROKER_HEARTBEAT: int
@@ -37,11 +70,49 @@ class Settings(BaseSettings):
     BROKER_ATTEMPT_DELAY: int
     QUEUE_NAME: str
     EXCHANGE_NAME: str
+    TEAM_CACHE_MAX_SIZE: int
+    TEAM_CACHE_TTL: int
+    PLAYERS_PAGE_SIZE_DEFAULT: int
+    PLAYERS_PAGE_SIZE_MAX: int
+    BULK_CREATE_MAX_ITEMS: int
+    GRAPHQL_DOCUMENT_CACHE_SIZE: int
+    APQ_CACHE_SIZE: int
+    APQ_CACHE_TTL: int
+    SUBSCRIPTION_QUEUE_SIZE: int
+    CONCURRENCY_LIMIT_ENABLED: bool
+    CONCURRENCY_LIMIT_INITIAL: int
+    CONCURRENCY_LIMIT_MIN: int
+    CONCURRENCY_LIMIT_MAX: int
+    CONCURRENCY_LATENCY_TARGET_MS: float
+    CONCURRENCY_BACKOFF_RATIO: float
+    CONCURRENCY_PRIORITY_SHARES: str
+    CONCURRENCY_RETRY_AFTER: int
+    PUBLISHER_BUFFERED: bool
+    PUBLISHER_QUEUE_SIZE: int
+    PUBLISHER_BATCH_SIZE: int
+    PUBLISHER_OVERFLOW_POLICY: str
+    PUBLISHER_FLUSH_TIMEOUT: int
+    PUBLISHER_CHANNEL_POOL_SIZE: int
+    EVENT_CODEC: str
+    EVENT_SCHEMA_VERSION: int
+    OUTBOX_BATCH_SIZE: int
+    OUTBOX_POLL_INTERVAL: float
+    OUTBOX_MAX_BACKOFF: float
+    OUTBOX_RETENTION_HOURS: float
+    OUTBOX_PURGE_INTERVAL: float
 
     @property
     def SQLALCHEMY_DATABASE_URI(self):
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def SQLALCHEMY_REPLICA_URIS(self):
+        return [
+            f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{host.strip()}/{self.DB_NAME}"
+            for host in self.DB_REPLICA_HOSTS.split(",")
+            if host.strip()
+        ]
+
     @property
     def API_GATEWAY_URL(self):
         return f"http://{self.API_GATEWAY_HOST}:{self.API_GATEWAY_PORT}{self.API_PREFIX}/graphql"
@@ -56,5 +127,6 @@ class Settings(BaseSettings):
         extra = "ignore"
 
 
+@lru_cache
 def get_settings():
     return Settings()
@@ -1,5 +1,18 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import random
+from typing import Dict
+
+import orjson
+
+from utils.config import get_settings
+
+settings = get_settings()
+
+LOG_FORMAT = "%(asctime)s[%(levelname)s][%(module)s.%(funcName)s][%(message)s]"
 
 
 class CustomFormatter(logging.Formatter):
@@ -18,6 +31,53 @@ class CustomFormatter(logging.Formatter):
         return super().format(record)
 
 
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "function": f"{record.module}.{record.funcName}()",
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of the records at INFO level and below; warnings and
+    errors always pass.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno > logging.INFO or random.random() < self.rate
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    # QueueHandler.prepare formats the message on the calling thread; hand the
+    # record over untouched so formatting happens on the listener thread.
+    def prepare(self, record):
+        return record
+
+
+def _parse_sampling(config: str) -> Dict[str, float]:
+    rates = {}
+    for item in config.split(","):
+        if "=" in item:
+            name, rate = item.split("=", 1)
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+sampling_rates = _parse_sampling(settings.LOG_SAMPLING)
+
+
 def logger_config(module: str) -> logging.Logger:
     """
     LOGGER function. Extends Python logging module and sets a custom config.
@@ -25,9 +85,7 @@ def logger_config(module: str) -> logging.Logger:
     return: Logger object
     usage: logger_config(__name__)
     """
-    formatter = CustomFormatter(
-        "%(asctime)s[%(levelname)s][%(module)s.%(funcName)s][%(message)s]"
-    )
+    formatter = CustomFormatter(LOG_FORMAT)
 
     handler = logging.StreamHandler()
     handler.setFormatter(formatter)
@@ -39,6 +97,11 @@ def logger_config(module: str) -> logging.Logger:
     if not logger.hasHandlers():
         logger.addHandler(handler)
 
+    if module in sampling_rates and not any(
+        isinstance(f, SamplingFilter) for f in logger.filters
+    ):
+        logger.addFilter(SamplingFilter(sampling_rates[module]))
+
     # Suppress logging from other libraries
     logging.getLogger("sqlalchemy").setLevel(logging.WARNING)
     logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -66,7 +129,18 @@ if not root_logger.hasHandlers():
 # Apply custom formatting to root logger handlers
 for handler in root_logger.handlers:
     handler.setFormatter(
-        CustomFormatter(
-            "%(asctime)s[%(levelname)s][%(module)s.%(funcName)s][%(message)s]"
-        )
+        JsonFormatter() if settings.LOG_JSON else CustomFormatter(LOG_FORMAT)
+    )
+
+# Move the output handlers behind a queue drained by a background thread, so
+# request handlers only pay for enqueuing the record.
+if settings.LOG_QUEUE_ENABLED and not any(
+    isinstance(handler, LazyQueueHandler) for handler in root_logger.handlers
+):
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, *root_logger.handlers, respect_handler_level=True
     )
+    root_logger.handlers = [LazyQueueHandler(log_queue)]
+    listener.start()
+    atexit.register(listener.stop)
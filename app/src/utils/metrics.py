@@ -0,0 +1,76 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+GRAPHQL_OPERATION_LATENCY = Histogram(
+    "graphql_operation_duration_seconds",
+    "Latency of GraphQL operations",
+    ["operation_type", "operation_name"],
+)
+GRAPHQL_OPERATION_ERRORS = Counter(
+    "graphql_operation_errors_total",
+    "GraphQL operations that returned errors",
+    ["operation_type", "operation_name"],
+)
+GRAPHQL_OPERATIONS_IN_FLIGHT = Gauge(
+    "graphql_operations_in_flight",
+    "GraphQL operations currently being processed",
+)
+
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "Latency of database statements",
+    ["statement"],
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 30),
+)
+
+EVENT_PUBLISH_LATENCY = Histogram(
+    "event_publish_duration_seconds",
+    "Time until a batch of events is confirmed by the broker",
+)
+EVENTS_PUBLISHED = Counter(
+    "events_published_total",
+    "Events confirmed by the broker",
+)
+EVENT_PUBLISH_FAILURES = Counter(
+    "event_publish_failures_total",
+    "Events the broker failed to confirm",
+)
+
+PERSISTED_QUERY_LOOKUPS = Counter(
+    "graphql_persisted_query_lookups_total",
+    "Automatic persisted query lookups by result",
+    ["result"],
+)
+
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "In-process cache lookups by result",
+    ["cache", "result"],
+)
+CACHE_EVICTIONS = Counter(
+    "cache_evictions_total",
+    "Entries evicted from an in-process cache to stay within its size",
+    ["cache"],
+)
+
+SUBSCRIPTIONS_ACTIVE = Gauge(
+    "graphql_subscriptions_active",
+    "Open GraphQL subscriptions",
+)
+SUBSCRIPTION_EVENTS_DROPPED = Counter(
+    "graphql_subscription_events_dropped_total",
+    "Events dropped because a subscriber's queue was full",
+)
+
+CONCURRENCY_LIMIT = Gauge(
+    "graphql_concurrency_limit",
+    "Current adaptive limit on concurrently executing GraphQL operations",
+)
+OPERATIONS_SHED = Counter(
+    "graphql_operations_shed_total",
+    "GraphQL operations rejected by the concurrency limiter",
+    ["operation_type"],
+)
@@ -0,0 +1,92 @@
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+MAX_SPANS = 1000
+
+
+class Profile:
+    """
+    Span breakdown of a single request. Spans are recorded with their offset
+    from the start of the request and their nesting depth.
+    usage: with span("repository.get_by_name"): ...
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.truncated = 0
+
+    def add(self, name: str, start: float, end: float, depth: int):
+        if len(self.spans) >= MAX_SPANS:
+            self.truncated += 1
+            return
+        self.spans.append(
+            {
+                "name": name,
+                "depth": depth,
+                "start_ms": round((start - self.start) * 1000, 3),
+                "duration_ms": round((end - start) * 1000, 3),
+            }
+        )
+
+    def elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self.start) * 1000, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "total_ms": self.elapsed_ms(),
+            "spans": sorted(self.spans, key=lambda s: s["start_ms"]),
+        }
+        if self.truncated:
+            result["truncated_spans"] = self.truncated
+        return result
+
+
+current_profile: ContextVar[Optional[Profile]] = ContextVar(
+    "current_profile", default=None
+)
+_depth: ContextVar[int] = ContextVar("profile_depth", default=0)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    profile = current_profile.get()
+    if profile is None:
+        yield
+        return
+    depth = _depth.get()
+    token = _depth.set(depth + 1)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(name, start, time.perf_counter(), depth)
+        _depth.reset(token)
+
+
+def record_span(name: str, start: float, end: float):
+    profile = current_profile.get()
+    if profile is not None:
+        profile.add(name, start, end, _depth.get())
+
+
+def profiled(name: str):
+    """
+    Decorator recording each call of an async function as a span.
+    usage: @profiled("service.create_player")
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if current_profile.get() is None:
+                return await func(*args, **kwargs)
+            with span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
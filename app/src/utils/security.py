@@ -0,0 +1,86 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from utils.cache import TTLCache
+from utils.config import get_settings
+from utils.profiling import profiled
+
+settings = get_settings()
+
+SCRYPT_PREFIX = "scrypt"
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_DKLEN = 32
+
+# scrypt is CPU and memory bound; running it on the event loop would stall
+# every other request, so hashing and verification use a bounded pool.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+
+verification_cache: TTLCache[bool] = TTLCache(
+    maxsize=settings.PASSWORD_VERIFY_CACHE_SIZE,
+    ttl=settings.PASSWORD_VERIFY_CACHE_TTL,
+    name="password_verification",
+)
+
+
+def _b64encode(value: bytes) -> str:
+    return base64.b64encode(value).decode()
+
+
+def is_hashed(stored: Optional[str]) -> bool:
+    return bool(stored) and stored.startswith(f"{SCRYPT_PREFIX}$")
+
+
+def hash_password_sync(password: str, n: int = settings.PASSWORD_SCRYPT_N) -> str:
+    salt = os.urandom(16)
+    digest = hashlib.scrypt(
+        password.encode(), salt=salt, n=n, r=SCRYPT_R, p=SCRYPT_P, dklen=SCRYPT_DKLEN
+    )
+    return f"{SCRYPT_PREFIX}${n}${SCRYPT_R}${SCRYPT_P}${_b64encode(salt)}${_b64encode(digest)}"
+
+
+def verify_password_sync(password: str, stored: Optional[str]) -> bool:
+    if not stored:
+        return False
+    if not is_hashed(stored):
+        # Legacy rows still hold the plaintext password.
+        return hmac.compare_digest(password.encode(), stored.encode())
+    _, n, r, p, salt, digest = stored.split("$")
+    expected = base64.b64decode(digest)
+    actual = hashlib.scrypt(
+        password.encode(),
+        salt=base64.b64decode(salt),
+        n=int(n),
+        r=int(r),
+        p=int(p),
+        dklen=len(expected),
+    )
+    return hmac.compare_digest(actual, expected)
+
+
+@profiled("security.hash_password")
+async def hash_password(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, hash_password_sync, password)
+
+
+@profiled("security.verify_password")
+async def verify_password(password: str, stored: Optional[str]) -> bool:
+    # The key binds the stored hash, so a changed password never hits a stale entry.
+    key = (stored, hashlib.sha256(password.encode()).hexdigest())
+    if verification_cache.get(key):
+        return True
+    loop = asyncio.get_running_loop()
+    verified = await loop.run_in_executor(
+        _executor, verify_password_sync, password, stored
+    )
+    if verified:
+        verification_cache.set(key, True)
+    return verified
@@ -0,0 +1,55 @@
+"""
+Micro-benchmark of the event codecs on the team_created and player_created
+payloads, compared with the previous stdlib json encoding.
+usage: python tests/benchmark/bench_codecs.py [--iterations 100000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../src"))
+
+from events.publisher import CODECS, build_event  # noqa: E402
+
+EVENTS = {
+    "team_created": build_event(
+        "team_created",
+        {"team_id": 1024, "team_name": "Team1024"},
+    ),
+    "player_created": build_event(
+        "player_created",
+        {
+            "player_id": 40960,
+            "player_name": "Jane Doe",
+            "team_id": 1024,
+            "created_at": datetime.now(timezone.utc),
+        },
+    ),
+}
+
+
+def stdlib_json(event):
+    return json.dumps(event, default=datetime.isoformat).encode()
+
+
+def run(iterations: int):
+    encoders = {"stdlib-json": stdlib_json}
+    encoders.update({name: codec().encode for name, codec in CODECS.items()})
+    print(f"{'event':<16}{'codec':<14}{'size (B)':>10}{'ops/s':>14}{'us/op':>10}")
+    for event_name, event in EVENTS.items():
+        for codec_name, encode in encoders.items():
+            seconds = timeit.timeit(lambda: encode(event), number=iterations)
+            print(
+                f"{event_name:<16}{codec_name:<14}{len(encode(event)):>10}"
+                f"{iterations / seconds:>14,.0f}{seconds / iterations * 1e6:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=100_000)
+    run(parser.parse_args().iterations)
@@ -0,0 +1,71 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../src"))
+
+from data.unit_of_work import UnitOfWork  # noqa: E402
+from service.team_service import create_team_service  # noqa: E402
+
+
+class StubSession:
+    def __init__(self, name: str):
+        self.name = name
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+    async def close(self):
+        self.closed = True
+
+
+class StubDatabase:
+    """
+    Stands in for DatabaseSession: hands out stub sessions and never connects.
+    """
+
+    def __init__(self, replicas: int = 0):
+        self.replicas = replicas
+        self.sessions = []
+
+    @property
+    def has_replicas(self) -> bool:
+        return self.replicas > 0
+
+    def SessionLocal(self) -> StubSession:
+        return self._open("primary")
+
+    def replica_session(self) -> StubSession:
+        return self._open("replica")
+
+    def _open(self, name: str) -> StubSession:
+        session = StubSession(name)
+        self.sessions.append(session)
+        return session
+
+
+@pytest.fixture
+def database():
+    return StubDatabase()
+
+
+@pytest.fixture
+def replicated_database():
+    return StubDatabase(replicas=1)
+
+
+@pytest.fixture
+def uow(database):
+    return UnitOfWork(database)
+
+
+@pytest.fixture
+def team_service():
+    return create_team_service("memory")
@@ -0,0 +1,78 @@
+from prometheus_client import REGISTRY
+
+from utils.cache import TTLCache
+
+
+def expire(cache: TTLCache, key):
+    # Moves the entry's expiry into the past instead of sleeping for the TTL.
+    expires_at, value = cache._data[key]
+    cache._data[key] = (expires_at - cache.ttl - 1, value)
+
+
+def test_get_returns_value_until_expired():
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    expire(cache, "a")
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_set_replaces_value_and_refreshes_expiry():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    expire(cache, "a")
+    cache.set("a", 2)
+    assert cache.get("a") == 2
+    assert len(cache) == 1
+
+
+def test_zero_size_cache_stores_nothing():
+    cache = TTLCache(maxsize=0, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_invalidate_removes_entry():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.invalidate("a")
+    cache.invalidate("missing")
+    assert cache.get("a") is None
+
+
+def sample(name, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_named_cache_exports_metrics():
+    cache = TTLCache(maxsize=1, ttl=60, name="test")
+
+    def counts():
+        return [
+            sample("cache_lookups_total", cache="test", result="hit"),
+            sample("cache_lookups_total", cache="test", result="miss"),
+            sample("cache_evictions_total", cache="test"),
+        ]
+
+    before = counts()
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+    cache.set("b", 2)
+    assert [a - b for a, b in zip(counts(), before)] == [1, 1, 1]
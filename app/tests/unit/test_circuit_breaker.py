@@ -0,0 +1,87 @@
+import asyncio
+
+import httpx
+import pytest
+
+from service.api_gateway_client import (
+    ApiGatewayClient,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+def elapse(breaker: CircuitBreaker, seconds: float):
+    breaker.opened_at -= seconds
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_breaker_half_open_allows_single_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    elapse(breaker, 10)
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_breaker_closes_after_successful_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    elapse(breaker, 10)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_breaker_reopens_after_failed_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    elapse(breaker, 10)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    elapse(breaker, 10)
+    assert breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_does_not_wedge_breaker():
+    hang = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if not hang.is_set():
+            await asyncio.sleep(60)
+        return httpx.Response(200, json={"ok": True})
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    client = ApiGatewayClient(
+        url="http://gateway/graphql",
+        transport=httpx.MockTransport(handler),
+        retries=0,
+        breaker=breaker,
+    )
+    try:
+        breaker.record_failure()
+        elapse(breaker, 10)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.post({"query": "{ x }"}), 0.05)
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            await client.post({"query": "{ x }"})
+
+        hang.set()
+        elapse(breaker, 10)
+        assert await client.post({"query": "{ x }"}) == {"ok": True}
+        assert breaker.state == "closed"
+    finally:
+        await client.close()
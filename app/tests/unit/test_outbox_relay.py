@@ -0,0 +1,120 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+import pytest
+
+from data.unit_of_work import UnitOfWork
+from events.event_bus import event_bus
+from events.outbox_relay import PURGE_BATCH_SIZE, OutboxRelay
+from repository.memory_repository import InMemoryOutboxRepository, InMemoryStore
+
+
+class StubPublisher:
+    def __init__(self, confirm: bool = True):
+        self.confirm = confirm
+        self.batches: List[List[Dict[str, Any]]] = []
+
+    async def publish_batch(self, messages: List[Dict[str, Any]]) -> List[bool]:
+        self.batches.append(messages)
+        return [self.confirm] * len(messages)
+
+
+async def add_events(repository, database, count: int):
+    uow = UnitOfWork(database)
+    async with uow.transaction():
+        await repository.add_many(
+            uow, "team_created", [{"team_id": i} for i in range(count)]
+        )
+    await uow.close()
+
+
+@pytest.fixture
+def outbox_repository():
+    return InMemoryOutboxRepository(InMemoryStore())
+
+
+@pytest.mark.asyncio
+async def test_relay_publishes_and_marks_delivered(outbox_repository, database):
+    await add_events(outbox_repository, database, 3)
+    publisher = StubPublisher()
+    relay = OutboxRelay(
+        publisher,
+        database=database,
+        batch_size=2,
+        outbox_repository=outbox_repository,
+    )
+    async with event_bus.subscribe() as events:
+        assert await relay.relay_once() == 2
+        assert await relay.relay_once() == 1
+        assert await relay.relay_once() == 0
+        assert [len(batch) for batch in publisher.batches] == [2, 1]
+        assert outbox_repository.store.outbox == {}
+        assert (await events.__anext__())["event_type"] == "team_created"
+
+
+@pytest.mark.asyncio
+async def test_relay_keeps_unconfirmed_events_and_backs_off(
+    outbox_repository, database
+):
+    await add_events(outbox_repository, database, 2)
+    relay = OutboxRelay(
+        StubPublisher(confirm=False),
+        database=database,
+        batch_size=2,
+        poll_interval=0.5,
+        outbox_repository=outbox_repository,
+        max_backoff=1.5,
+    )
+    assert await relay.relay_once() == 0
+    assert len(outbox_repository.store.outbox) == 2
+    assert relay.next_delay() == 1.0
+    await relay.relay_once()
+    assert relay.next_delay() == 1.5
+
+    relay.publisher = StubPublisher()
+    assert await relay.relay_once() == 2
+    assert relay.next_delay() == 0.5
+
+
+class PurgingOutboxRepository(InMemoryOutboxRepository):
+    def __init__(self, deleted: List[int]):
+        super().__init__(InMemoryStore())
+        self.deleted = deleted
+        self.calls: List[datetime] = []
+
+    async def purge_delivered(self, uow, before: datetime, limit: int) -> int:
+        self.calls.append(before)
+        return self.deleted[len(self.calls) - 1]
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_in_batches_until_done(database):
+    repository = PurgingOutboxRepository([PURGE_BATCH_SIZE, 3])
+    relay = OutboxRelay(
+        StubPublisher(),
+        database=database,
+        outbox_repository=repository,
+        retention_hours=24,
+    )
+    assert await relay.purge_once() == PURGE_BATCH_SIZE + 3
+    assert len(repository.calls) == 2
+    age = datetime.now(timezone.utc) - repository.calls[0]
+    assert timedelta(hours=24) <= age < timedelta(hours=24, minutes=1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("retention_hours, purges", [(24, 1), (0, 0)])
+async def test_relay_purges_only_with_retention(database, retention_hours, purges):
+    repository = PurgingOutboxRepository([0])
+    relay = OutboxRelay(
+        StubPublisher(),
+        database=database,
+        outbox_repository=repository,
+        retention_hours=retention_hours,
+        purge_interval=60,
+    )
+    relay.start()
+    await asyncio.sleep(0.05)
+    await relay.stop(1)
+    assert len(repository.calls) == purges
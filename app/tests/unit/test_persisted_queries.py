@@ -0,0 +1,59 @@
+import hashlib
+
+import pytest
+from strawberry.http import GraphQLRequestData
+
+from routes.graphql_router import persisted_queries, resolve_persisted_query
+
+QUERY = "{ __typename }"
+QUERY_HASH = hashlib.sha256(QUERY.encode()).hexdigest()
+
+
+def request(query, persisted_query) -> GraphQLRequestData:
+    return GraphQLRequestData(
+        query=query,
+        variables=None,
+        operation_name=None,
+        extensions={"persistedQuery": persisted_query},
+    )
+
+
+def error_code(request_data: GraphQLRequestData):
+    error = resolve_persisted_query(request_data)
+    return None if error is None else error.extensions["code"]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    persisted_queries.clear()
+
+
+def test_registered_query_is_resolved_by_hash():
+    persisted_query = {"version": 1, "sha256Hash": QUERY_HASH}
+    assert error_code(request(None, persisted_query)) == "PERSISTED_QUERY_NOT_FOUND"
+    assert error_code(request(QUERY, persisted_query)) is None
+    request_data = request(None, persisted_query)
+    assert error_code(request_data) is None
+    assert request_data.query == QUERY
+
+
+def test_mismatched_hash_is_rejected():
+    persisted_query = {"version": 1, "sha256Hash": "0" * 64}
+    assert (
+        error_code(request(QUERY, persisted_query)) == "PERSISTED_QUERY_HASH_MISMATCH"
+    )
+
+
+def test_unsupported_version_is_rejected():
+    persisted_query = {"version": 2, "sha256Hash": QUERY_HASH}
+    assert (
+        error_code(request(QUERY, persisted_query)) == "PERSISTED_QUERY_NOT_SUPPORTED"
+    )
+
+
+@pytest.mark.parametrize(
+    "persisted_query",
+    ["x", None, ["x"], {"version": 1}, {"version": 1, "sha256Hash": 1}],
+)
+def test_malformed_persisted_query_is_rejected(persisted_query):
+    assert error_code(request(None, persisted_query)) == "PERSISTED_QUERY_INVALID"
@@ -0,0 +1,165 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from events.publisher import Publisher
+
+
+class StubExchange:
+    def __init__(self, broker: "StubConnection"):
+        self.broker = broker
+
+    async def publish(self, message, routing_key=""):
+        await self.broker.gate.wait()
+        if self.broker.fail:
+            raise ConnectionError("not confirmed")
+        self.broker.messages.append(message.body)
+
+
+class StubChannel:
+    def __init__(self, broker: "StubConnection"):
+        self.broker = broker
+        self.is_closed = False
+
+    async def declare_exchange(self, *args, **kwargs):
+        return StubExchange(self.broker)
+
+    async def close(self):
+        self.is_closed = True
+
+
+class StubConnection:
+    """
+    Stand-in for the broker connection. Publishes wait until the gate is open,
+    so a test can hold batches in flight.
+    """
+
+    def __init__(self):
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.fail = False
+        self.closed = False
+        self.messages: List[bytes] = []
+
+    async def channel(self, **kwargs):
+        return StubChannel(self)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def broker():
+    return StubConnection()
+
+
+async def connect(broker, **kwargs) -> Publisher:
+    options = dict(buffered=True, channel_pool_size=1, overflow_policy="block")
+    options.update(kwargs)
+    publisher = Publisher(broker, exchange_name="events", **options)
+    await publisher.connect()
+    return publisher
+
+
+def message(index: int):
+    return {"event_type": "team_created", "data": {"team_id": index}}
+
+
+@pytest.mark.asyncio
+async def test_unbuffered_publish_waits_for_confirm(broker):
+    publisher = await connect(broker, buffered=False)
+    await publisher.publish(message(1))
+    assert len(broker.messages) == 1
+    broker.fail = True
+    with pytest.raises(ConnectionError):
+        await publisher.publish(message(2))
+    assert publisher.stats()["failed"] == 1
+    await publisher.close()
+
+
+@pytest.mark.asyncio
+async def test_buffered_publish_sends_batches(broker):
+    publisher = await connect(broker, batch_size=3)
+    batches = []
+    publish_batch = publisher.publish_batch
+
+    async def record(messages):
+        batches.append(len(messages))
+        return await publish_batch(messages)
+
+    publisher.publish_batch = record
+    for index in range(7):
+        await publisher.publish(message(index))
+    await publisher.flush(1)
+    assert batches == [3, 3, 1]
+    assert publisher.stats()["published"] == 7
+    await publisher.close()
+
+
+@pytest.mark.asyncio
+async def test_drop_policy_counts_dropped_messages(broker):
+    broker.gate.clear()
+    publisher = await connect(broker, queue_size=2, overflow_policy="drop")
+    for index in range(5):
+        await publisher.publish(message(index))
+    assert publisher.stats()["dropped"] == 3
+    broker.gate.set()
+    await publisher.flush(1)
+    assert len(broker.messages) == 2
+    await publisher.close()
+
+
+@pytest.mark.asyncio
+async def test_block_policy_waits_for_queue_space(broker):
+    broker.gate.clear()
+    publisher = await connect(broker, queue_size=1, batch_size=1)
+
+    async def publish_all():
+        for index in range(3):
+            await publisher.publish(message(index))
+
+    task = asyncio.create_task(publish_all())
+    await asyncio.sleep(0.05)
+    # One message is in flight and one fills the queue; the third waits.
+    assert not task.done()
+    broker.gate.set()
+    await asyncio.wait_for(task, 1)
+    await publisher.flush(1)
+    assert len(broker.messages) == 3
+    assert publisher.stats()["dropped"] == 0
+    await publisher.close()
+
+
+@pytest.mark.asyncio
+async def test_flush_gives_up_after_timeout(broker):
+    broker.gate.clear()
+    publisher = await connect(broker)
+    await publisher.publish(message(1))
+    await asyncio.wait_for(publisher.flush(0.05), 1)
+    assert broker.messages == []
+    broker.gate.set()
+    await publisher.flush(1)
+    assert len(broker.messages) == 1
+    await publisher.close()
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_pending_messages(broker):
+    publisher = await connect(broker)
+    for index in range(3):
+        await publisher.publish(message(index))
+    await publisher.close()
+    assert len(broker.messages) == 3
+    assert broker.closed
+
+
+@pytest.mark.asyncio
+async def test_close_without_flush_does_not_wait(broker):
+    broker.gate.clear()
+    publisher = await connect(broker)
+    await publisher.publish(message(1))
+    await asyncio.wait_for(publisher.close(flush=False), 1)
+    assert broker.messages == []
+    assert broker.closed
+    assert publisher.stats()["buffered"] is False
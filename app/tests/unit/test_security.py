@@ -0,0 +1,38 @@
+import pytest
+
+from utils.security import (
+    hash_password_sync,
+    is_hashed,
+    verify_password,
+    verify_password_sync,
+)
+
+# A low cost factor keeps the tests fast; it is read back from the hash.
+FAST_N = 2**4
+
+
+def test_hashed_password_verifies():
+    stored = hash_password_sync("secret", n=FAST_N)
+    assert is_hashed(stored)
+    assert verify_password_sync("secret", stored)
+    assert not verify_password_sync("wrong", stored)
+
+
+def test_legacy_plaintext_password_verifies():
+    assert not is_hashed("secret")
+    assert verify_password_sync("secret", "secret")
+    assert not verify_password_sync("wrong", "secret")
+
+
+@pytest.mark.parametrize("stored", [None, ""])
+def test_missing_password_never_verifies(stored):
+    assert not is_hashed(stored)
+    assert not verify_password_sync("", stored)
+    assert not verify_password_sync("secret", stored)
+
+
+@pytest.mark.asyncio
+async def test_verify_password_off_loop():
+    stored = hash_password_sync("secret", n=FAST_N)
+    assert await verify_password("secret", stored)
+    assert not await verify_password("secret", None)
@@ -0,0 +1,101 @@
+import pytest
+
+from resolver.player_schema import PlayerDataInput
+from resolver.team_schema import TeamDataInput
+from service.team_service import TeamService
+
+
+async def create_team(team_service, uow, team_name: str):
+    return await team_service.create_team(
+        uow, TeamDataInput(team_name=team_name, team_password="secret")
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_players_pages_with_cursors(team_service, uow):
+    await create_team(team_service, uow, "a")
+    names = [f"player{i}" for i in range(5)]
+    await team_service.create_players(uow, "a", names)
+
+    seen = []
+    after = None
+    pages = 0
+    while True:
+        page = await team_service.get_players(uow, "a", first=2, after=after)
+        seen += [player.player_name for player in page.players_data]
+        pages += 1
+        if not page.page_info.has_next_page:
+            break
+        after = page.page_info.end_cursor
+    assert seen == names
+    assert pages == 3
+
+
+@pytest.mark.asyncio
+async def test_get_players_rejects_bad_arguments(team_service, uow):
+    await create_team(team_service, uow, "a")
+    await team_service.create_player(
+        uow, PlayerDataInput(team_name="a", player_name="x")
+    )
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        await team_service.get_players(uow, "a", after="not-a-cursor")
+    with pytest.raises(ValueError, match="positive"):
+        await team_service.get_players(uow, "a", first=0)
+
+
+def test_cursor_round_trip():
+    assert TeamService.decode_cursor(TeamService.encode_cursor(42)) == 42
+
+
+@pytest.mark.asyncio
+async def test_create_teams_reports_per_item_errors(team_service, uow):
+    await create_team(team_service, uow, "a")
+    result = await team_service.create_teams(
+        uow,
+        [
+            TeamDataInput(team_name=name, team_password="secret")
+            for name in ["a", "b", "c", "b"]
+        ],
+    )
+    assert [team.team_name for team in result.teams_data] == ["b", "c"]
+    assert [(error.index, error.name) for error in result.errors] == [
+        (0, "a"),
+        (3, "b"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_create_players_reports_per_item_errors(team_service, uow):
+    await create_team(team_service, uow, "a")
+    await team_service.create_player(
+        uow, PlayerDataInput(team_name="a", player_name="x")
+    )
+    result = await team_service.create_players(uow, "a", ["x", "y", "z", "y"])
+    assert [player.player_name for player in result.players_data] == ["y", "z"]
+    assert [(error.index, error.name) for error in result.errors] == [
+        (0, "x"),
+        (3, "y"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_create_is_rolled_back(team_service, uow):
+    await create_team(team_service, uow, "a")
+    with pytest.raises(ValueError, match="already exists"):
+        await create_team(team_service, uow, "a")
+    store = team_service.team_repository.store
+    assert list(store.team_ids_by_name) == ["a"]
+    assert [event.event_type for event in store.outbox.values()] == ["team_created"]
+
+
+@pytest.mark.asyncio
+async def test_roster_etag_changes_with_roster(team_service, uow):
+    await create_team(team_service, uow, "a")
+    before = await team_service.get_roster_etag(uow, "a")
+    assert before == await team_service.get_roster_etag(uow, "a")
+    assert before != await team_service.get_roster_etag(uow, "a", first=10)
+    await team_service.create_player(
+        uow, PlayerDataInput(team_name="a", player_name="x")
+    )
+    assert before != await team_service.get_roster_etag(uow, "a")
+    assert await team_service.get_roster_etag(uow, "missing") is None
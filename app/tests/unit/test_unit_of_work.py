@@ -0,0 +1,64 @@
+import pytest
+
+from data.unit_of_work import UnitOfWork
+
+
+@pytest.mark.asyncio
+async def test_rollback_hooks_run_in_reverse_on_error(uow):
+    undone = []
+    with pytest.raises(RuntimeError):
+        async with uow.transaction():
+            uow.on_rollback(lambda: undone.append("first"))
+            uow.on_rollback(lambda: undone.append("second"))
+            raise RuntimeError("boom")
+    assert undone == ["second", "first"]
+
+
+@pytest.mark.asyncio
+async def test_commit_discards_rollback_hooks(uow):
+    undone = []
+    async with uow.transaction():
+        uow.on_rollback(lambda: undone.append("write"))
+    await uow.close()
+    assert undone == []
+
+
+@pytest.mark.asyncio
+async def test_close_without_commit_runs_rollback_hooks(uow):
+    undone = []
+    uow.on_rollback(lambda: undone.append("write"))
+    await uow.close()
+    assert undone == ["write"]
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_until_a_write(replicated_database):
+    database = replicated_database
+    uow = UnitOfWork(database)
+    async with uow.session(readonly=True) as session:
+        assert session.name == "replica"
+    async with uow.session() as session:
+        assert session.name == "primary"
+    # Once the request has written, it reads its own writes from the primary.
+    async with uow.session(readonly=True) as session:
+        assert session.name == "primary"
+    await uow.close()
+    assert all(session.closed for session in database.sessions)
+
+
+@pytest.mark.asyncio
+async def test_reads_use_primary_without_replicas(uow, database):
+    async with uow.session(readonly=True) as session:
+        assert session.name == "primary"
+    async with uow.session() as same:
+        assert same is session
+    assert len(database.sessions) == 1
+
+
+@pytest.mark.asyncio
+async def test_transaction_pins_primary(replicated_database):
+    uow = UnitOfWork(replicated_database)
+    async with uow.transaction():
+        async with uow.session(readonly=True) as session:
+            assert session.name == "primary"
+    assert session.commits == 1